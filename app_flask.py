@@ -3,11 +3,18 @@ Canadian Medical Product Short Name Generator - Flask API
 Azure部署版本
 """
 
-from flask import Flask, request, jsonify, render_template_string
+from flask import Flask, Response, request, jsonify, render_template_string, stream_with_context, g
 from flask_cors import CORS
 import os
+import gzip
+import json
+import zlib
+import bisect
+import hashlib
+import threading
+import time
 from pathlib import Path
-from processor import CorrectedShortNameProcessor
+from processor import CorrectedShortNameProcessor, ParallelBatchProcessor, ResultStore
 
 app = Flask(__name__)
 CORS(app)  # 允许跨域请求
@@ -19,6 +26,165 @@ processor = None
 BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_DICTIONARY_PATH = BASE_DIR / "data" / "dictionary.xlsx"
 
+# 热加载词典：只允许加载该目录下的文件，上传的词典保存在其 uploads 子目录
+DICTIONARY_DIR = Path(os.environ.get('DICTIONARY_DIR', BASE_DIR / "data")).resolve()
+UPLOAD_DIR = DICTIONARY_DIR / "uploads"
+DICTIONARY_SUFFIXES = {'.xlsx', '.xls', '.csv'}
+
+# 当前生效词典的标记文件：多 worker 部署时，其他 worker 据此跟随热加载，重启后也沿用
+ACTIVE_DICTIONARY_MARKER = DICTIONARY_DIR / ".active_dictionary"
+MARKER_CHECK_INTERVAL = float(os.environ.get('DICTIONARY_MARKER_CHECK_INTERVAL', 2.0))
+marker_state = {'checked_at': 0.0, 'mtime_ns': None}
+
+# 同一时间只允许一个后台加载任务
+reload_lock = threading.Lock()
+reload_status = {
+    'state': 'idle',  # idle / loading / ready / failed
+    'reload_id': 0,
+    'dictionary_path': None,
+    'error': None,
+    'started_at': None,
+    'finished_at': None
+}
+
+# NDJSON 流式批处理：请求体每行一个描述，响应逐行返回结果
+NDJSON_MIMETYPES = {'application/x-ndjson', 'application/ndjson', 'application/jsonl'}
+# gzip 响应每隔多少行刷新一次压缩块（逐行刷新会严重降低压缩率）
+NDJSON_GZIP_FLUSH_LINES = 64
+# 读取 gzip 请求体可能出现的错误：BadGzipFile 属于 OSError，数据被截断时为 EOFError
+GZIP_DECODE_ERRORS = (OSError, EOFError, zlib.error)
+# 单行和（解压后）请求体总大小的上限，防止超长行或 gzip 炸弹耗尽内存和 CPU
+NDJSON_MAX_LINE_BYTES = int(os.environ.get('NDJSON_MAX_LINE_BYTES', 64 * 1024))
+NDJSON_MAX_BODY_BYTES = int(os.environ.get('NDJSON_MAX_BODY_BYTES', 256 * 1024 * 1024))
+
+# 批量并行：去重后的描述数达到阈值才使用进程池，小批量直接在当前线程处理
+# 每个 gunicorn worker 各有一个进程池，默认按 worker 数均分 CPU 核数（最多4个），
+# 总进程数约为 WEB_CONCURRENCY × (1 + BATCH_WORKERS)
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+BATCH_WORKERS = int(os.environ.get(
+    'BATCH_WORKERS', max(1, min(4, (os.cpu_count() or 1) // max(1, WEB_CONCURRENCY)))
+))
+BATCH_PARALLEL_THRESHOLD = int(os.environ.get('BATCH_PARALLEL_THRESHOLD', 200))
+BATCH_CHUNK_SIZE = int(os.environ.get('BATCH_CHUNK_SIZE', 250))
+
+# 批量进程池：按需在每个 worker 进程内创建（不在 gunicorn 主进程中创建）
+# 池内进程直接继承创建时已加载的词典，因此按词典路径和内容哈希判断是否需要重建
+batch_engine = None
+batch_engine_key = None
+batch_engine_lock = threading.Lock()
+
+# 结果缓存容量（ERP 会重复发送相同描述），设为 0 可关闭缓存
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 10000))
+
+# 分阶段耗时指标默认关闭：设为 N 时每 N 条（未命中缓存的）描述记录一次各阶段耗时，1 为全部记录
+STAGE_PROFILE_EVERY = int(os.environ.get('STAGE_PROFILE_EVERY', 0))
+# 同时用 tracemalloc 记录各阶段分配的字节数（会明显拖慢处理，只在排查内存问题时开启）
+STAGE_PROFILE_ALLOCATIONS = os.environ.get('STAGE_PROFILE_ALLOCATIONS', '').lower() in ('1', 'true', 'yes')
+
+# 可选的持久化结果库（SQLite），重启后批量接口仍可复用已计算的结果；未设置时不启用
+RESULT_STORE_PATH = os.environ.get('RESULT_STORE_PATH')
+result_store = ResultStore(RESULT_STORE_PATH) if RESULT_STORE_PATH else None
+
+# Prometheus 指标（/api/metrics）：每个进程各自统计，不依赖 prometheus_client
+class Counter:
+    """线程安全的计数器，按标签值分组"""
+    
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+    
+    def collect(self):
+        """生成 Prometheus 文本格式的行"""
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            yield f"{self.name}{format_labels(self.label_names, label_values)} {value}"
+
+class Histogram:
+    """线程安全的直方图（累积桶），按标签值分组"""
+    
+    def __init__(self, name, help_text, buckets, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.label_names = label_names
+        self._series = {}  # 标签值 -> [各桶计数..., +Inf 桶计数, 总和]
+        self._lock = threading.Lock()
+    
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+    
+    def collect(self):
+        """生成 Prometheus 文本格式的行（桶计数为累积值）"""
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series_items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for label_values, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                labels = format_labels(self.label_names + ('le',), label_values + (str(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {series[-1]}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+def format_labels(names, values):
+    """格式化 Prometheus 标签，如 {stage="tokenize"}"""
+    if not names:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+STAGE_SECONDS = Histogram(
+    'shortname_stage_duration_seconds',
+    'Time spent in each processing stage per call (cached results excluded)',
+    (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1),
+    ('stage',)
+)
+STAGE_ALLOCATED_BYTES = Histogram(
+    'shortname_stage_allocated_bytes',
+    'Peak bytes allocated by each processing stage per call (only when allocation profiling is on)',
+    (256, 1024, 4096, 16384, 65536, 262144, 1048576),
+    ('stage',)
+)
+REQUEST_SECONDS = Histogram(
+    'shortname_http_request_duration_seconds',
+    'HTTP request latency until the response is returned (streamed bodies excluded)',
+    (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+    ('endpoint',)
+)
+REQUESTS_TOTAL = Counter(
+    'shortname_http_requests_total',
+    'HTTP requests by endpoint, method and status code',
+    ('endpoint', 'method', 'status')
+)
+BATCH_SIZE = Histogram(
+    'shortname_batch_size',
+    'Descriptions per /api/batch request',
+    (1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000),
+    ('mode',)
+)
+
 # HTML模板
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -124,7 +290,30 @@ Content-Type: application/json
 }
             </pre>
             
-            <h3>2. 获取状态</h3>
+            <h3>2. 批量生成（NDJSON 流式）</h3>
+            <pre>
+POST /api/batch
+Content-Type: application/x-ndjson
+Content-Encoding: gzip   (可选)
+Accept-Encoding: gzip    (可选)
+
+"Tape Surgical 1.25cm x 9.14m"
+{"description": "Scissor Mayo 170mm Straight"}
+            </pre>
+            
+            <h3>3. 热加载词典</h3>
+            <pre>
+POST /api/load_dictionary
+Content-Type: application/json
+
+{
+    "dictionary_path": "dictionary.xlsx"
+}
+
+（也可以用 multipart/form-data 上传 file 字段；GET /api/load_dictionary 查询加载状态）
+            </pre>
+            
+            <h3>4. 获取状态</h3>
             <pre>
 GET /api/status
             </pre>
@@ -200,20 +389,167 @@ GET /api/status
 </html>
 """
 
+def create_processor(dictionary_path=None):
+    """创建处理器，开启结果缓存，配置了分阶段指标时按采样记录各阶段耗时"""
+    new_processor = CorrectedShortNameProcessor(dictionary_path, cache_size=RESULT_CACHE_SIZE)
+    enable_stage_profiling(new_processor)
+    return new_processor
+
+def enable_stage_profiling(engine):
+    """按 STAGE_PROFILE_EVERY / STAGE_PROFILE_ALLOCATIONS 设置处理器或批量进程池的阶段分析"""
+    if STAGE_PROFILE_EVERY > 0:
+        engine.profile_hook = observe_stage
+        engine.profile_every = STAGE_PROFILE_EVERY
+        engine.profile_allocations = STAGE_PROFILE_ALLOCATIONS
+
+def observe_stage(profile):
+    """处理器的 profile_hook：记录每个处理阶段的耗时，开启内存分析时还记录分配的字节数"""
+    STAGE_SECONDS.observe(profile.seconds, profile.stage)
+    if profile.allocated_bytes is not None:
+        STAGE_ALLOCATED_BYTES.observe(profile.allocated_bytes, profile.stage)
+
 # 初始化：加载默认词典
 def init_processor():
     """初始化处理器，加载默认词典"""
     global processor
+    
+    # 优先使用最近一次热加载的词典
+    active_path, _ = read_active_dictionary()
+    if active_path is not None:
+        marker_state['mtime_ns'] = ACTIVE_DICTIONARY_MARKER.stat().st_mtime_ns
+        new_processor = create_processor()
+        if new_processor.dictionary.load_from_file(active_path):
+            processor = new_processor
+            print(f"✅ 成功加载词典：{active_path}")
+            return
+    
     if DEFAULT_DICTIONARY_PATH.exists():
         try:
-            processor = CorrectedShortNameProcessor(str(DEFAULT_DICTIONARY_PATH))
+            processor = create_processor(str(DEFAULT_DICTIONARY_PATH))
             print(f"✅ 成功加载词典：{DEFAULT_DICTIONARY_PATH}")
         except Exception as e:
             print(f"⚠️ 加载词典失败：{e}")
-            processor = CorrectedShortNameProcessor()
+            processor = create_processor()
     else:
         print(f"⚠️ 词典文件不存在：{DEFAULT_DICTIONARY_PATH}")
-        processor = CorrectedShortNameProcessor()
+        processor = create_processor()
+
+def read_active_dictionary():
+    """读取标记文件中的当前生效词典，返回 (路径, 内容哈希)；不存在或无效时路径为 None"""
+    try:
+        marker = json.loads(ACTIVE_DICTIONARY_MARKER.read_text(encoding='utf-8'))
+        path = marker['dictionary_path']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None, None
+    return (path, marker.get('source_hash')) if Path(path).is_file() else (None, None)
+
+def write_active_dictionary(path, source_hash):
+    """原子写入标记文件，通知其他 worker 切换词典
+    
+    同时写入词典内容哈希：原地修改同一路径的词典后重新加载，其他 worker 也能发现变化。
+    """
+    tmp_path = ACTIVE_DICTIONARY_MARKER.with_name(f"{ACTIVE_DICTIONARY_MARKER.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps({'dictionary_path': str(path), 'source_hash': source_hash}), encoding='utf-8')
+        os.replace(tmp_path, ACTIVE_DICTIONARY_MARKER)
+        marker_state['mtime_ns'] = ACTIVE_DICTIONARY_MARKER.stat().st_mtime_ns
+    except OSError as e:
+        print(f"⚠️ 无法写入词典标记文件，其他 worker 不会同步此次加载：{e}")
+
+@app.before_request
+def follow_active_dictionary():
+    """定期检查标记文件，其他 worker 热加载了新词典时在后台跟随加载"""
+    now = time.monotonic()
+    if now - marker_state['checked_at'] < MARKER_CHECK_INTERVAL:
+        return
+    marker_state['checked_at'] = now
+    
+    try:
+        mtime_ns = ACTIVE_DICTIONARY_MARKER.stat().st_mtime_ns
+    except OSError:
+        return
+    if mtime_ns == marker_state['mtime_ns']:
+        return
+    
+    active_path, active_hash = read_active_dictionary()
+    current = processor
+    if active_path is None or (current is not None and current.dictionary.loaded_from == active_path
+                               and current.dictionary.source_hash == active_hash):
+        marker_state['mtime_ns'] = mtime_ns
+        return
+    
+    if reload_lock.acquire(blocking=False):
+        marker_state['mtime_ns'] = mtime_ns
+        start_reload(Path(active_path), publish=False)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """记录请求数和请求耗时（按路由模板统计，避免未知路径产生大量标签）"""
+    endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+    REQUESTS_TOTAL.inc(endpoint, request.method, str(response.status_code))
+    started = g.get('request_started')
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint)
+    return response
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """以 Prometheus 文本格式导出当前进程的指标
+    
+    批量进程池中各进程的阶段耗时和结果缓存计数随每个分块返回，也计入这里。
+    """
+    current = processor
+    engine = batch_engine
+    lines = []
+    for metric in (REQUESTS_TOTAL, REQUEST_SECONDS, STAGE_SECONDS, STAGE_ALLOCATED_BYTES, BATCH_SIZE):
+        lines.extend(metric.collect())
+    
+    if current is not None:
+        dictionary = current.dictionary
+        lines.extend(gauge_lines('shortname_dictionary_entries', 'Abbreviations in the loaded dictionary',
+                                 len(dictionary.abbreviations)))
+        lines.extend(counter_lines('shortname_dictionary_lookups_total',
+                                   'Dictionary lookups since the dictionary was loaded', dictionary.lookups))
+        lines.extend(counter_lines('shortname_dictionary_hits_total',
+                                   'Dictionary lookups that found an abbreviation', dictionary.hits))
+        lines.extend(gauge_lines('shortname_dictionary_hit_ratio', 'Dictionary hits / lookups',
+                                 dictionary.hits / dictionary.lookups if dictionary.lookups else 0.0))
+        hook_errors = current.profile_hook_errors + (engine.profile_hook_errors if engine else 0)
+        lines.extend(counter_lines('shortname_profile_hook_errors_total',
+                                   'Stage timings lost because recording them failed', hook_errors))
+        
+        cache = combined_cache_stats(current, engine)
+        if cache is not None:
+            lines.extend(counter_lines('shortname_cache_hits_total', 'Result cache hits', cache['hits']))
+            lines.extend(counter_lines('shortname_cache_misses_total', 'Result cache misses', cache['misses']))
+            lines.extend(counter_lines('shortname_cache_evictions_total', 'Result cache evictions', cache['evictions']))
+            lines.extend(gauge_lines('shortname_cache_entries', 'Results currently cached', cache['size']))
+            lines.extend(gauge_lines('shortname_cache_hit_ratio', 'Result cache hits / lookups', cache['hit_rate']))
+    
+    return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
+
+def combined_cache_stats(current, engine):
+    """当前处理器与批量进程池的结果缓存统计之和；缓存条数只统计当前进程"""
+    cache = current.cache_stats()
+    pool_cache = engine.cache_stats() if engine is not None else None
+    if cache is None or pool_cache is None:
+        return cache
+    
+    for key in ('hits', 'misses', 'evictions'):
+        cache[key] += pool_cache[key]
+    lookups = cache['hits'] + cache['misses']
+    cache['hit_rate'] = cache['hits'] / lookups if lookups else 0.0
+    return cache
+
+def counter_lines(name, help_text, value):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {value}"]
+
+def gauge_lines(name, help_text, value):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
 
 @app.route('/')
 def index():
@@ -225,11 +561,14 @@ def get_status():
     """获取API状态"""
     global processor
     
+    current = processor
     return jsonify({
         'status': 'running',
-        'dictionary_loaded': processor is not None,
-        'dictionary_path': str(DEFAULT_DICTIONARY_PATH) if processor else None,
-        'abbreviation_count': len(processor.dictionary.abbreviations) if processor else 0
+        'dictionary_loaded': current is not None,
+        'dictionary_path': current.dictionary.loaded_from if current else None,
+        'abbreviation_count': len(current.dictionary.abbreviations) if current else 0,
+        'cache': current.cache_stats() if current else None,
+        'reload': dict(reload_status)
     })
 
 @app.route('/api/generate', methods=['POST'])
@@ -251,7 +590,7 @@ def generate_short_name():
         init_processor()
     
     try:
-        # 处理描述
+        # 处理描述（只读取一次全局引用，热加载替换不影响本次请求）
         result = processor.process_full_description(description)
         
         return jsonify({
@@ -269,11 +608,131 @@ def generate_short_name():
             'error': str(e)
         }), 500
 
+@app.route('/api/load_dictionary', methods=['POST'])
+def load_dictionary():
+    """在后台加载新词典，加载完成后原子替换处理器
+    
+    接受 multipart 上传的 file 字段，或 JSON 中的 dictionary_path（相对于 DICTIONARY_DIR）。
+    立即返回 202，加载进度通过 GET /api/load_dictionary 或 /api/status 查询。
+    加载成功后写入标记文件，其他 worker 会在下一次检查时跟随加载。
+    """
+    if 'file' in request.files:
+        path, error = save_uploaded_dictionary(request.files['file'])
+    else:
+        data = request.get_json(silent=True) or {}
+        path, error = resolve_dictionary_path(data.get('dictionary_path', ''))
+    
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    if not reload_lock.acquire(blocking=False):
+        return jsonify({
+            'success': False,
+            'error': '已有词典正在加载，请稍后再试',
+            'reload': dict(reload_status)
+        }), 409
+    
+    start_reload(path, publish=True)
+    
+    return jsonify({
+        'success': True,
+        'reload': dict(reload_status)
+    }), 202
+
+@app.route('/api/load_dictionary', methods=['GET'])
+def get_reload_status():
+    """查询最近一次词典加载的状态"""
+    return jsonify(dict(reload_status))
+
+def start_reload(path, publish):
+    """启动后台加载线程（调用前必须已持有 reload_lock）"""
+    reload_status.update({
+        'state': 'loading',
+        'reload_id': reload_status['reload_id'] + 1,
+        'dictionary_path': str(path),
+        'error': None,
+        'started_at': time.time(),
+        'finished_at': None
+    })
+    
+    try:
+        threading.Thread(target=reload_processor, args=(path, publish), daemon=True).start()
+    except Exception:
+        reload_lock.release()
+        raise
+
+def reload_processor(path, publish):
+    """后台线程：构建新处理器，完全就绪后再替换全局引用
+    
+    替换是一次引用赋值，进行中的请求继续使用旧处理器直到完成，
+    任何请求都不会看到加载到一半的词典。
+    """
+    global processor
+    
+    try:
+        new_processor = create_processor()
+        if not new_processor.dictionary.load_from_file(str(path)):
+            raise ValueError(f'无法加载词典：{path}')
+        
+        # 预先编译规则（和结果库指纹），避免替换后的第一个请求承担这些开销
+        new_processor.rules.compiled()
+        if result_store is not None:
+            new_processor.fingerprint()
+        
+        processor = new_processor
+        if publish:
+            write_active_dictionary(path, new_processor.dictionary.source_hash)
+        reload_status.update({'state': 'ready', 'finished_at': time.time()})
+        print(f"✅ 词典热加载完成：{path}")
+    except Exception as e:
+        reload_status.update({'state': 'failed', 'error': str(e), 'finished_at': time.time()})
+        print(f"⚠️ 词典热加载失败，继续使用当前词典：{e}")
+    finally:
+        reload_lock.release()
+
+def resolve_dictionary_path(raw_path):
+    """解析并校验词典路径，返回 (路径, 错误信息)"""
+    if not raw_path:
+        return None, '请提供 dictionary_path 或上传词典文件'
+    
+    path = (DICTIONARY_DIR / raw_path).resolve()
+    if not path.is_relative_to(DICTIONARY_DIR):
+        return None, f'词典必须位于 {DICTIONARY_DIR} 目录下'
+    if path.suffix.lower() not in DICTIONARY_SUFFIXES:
+        return None, f'不支持的词典格式：{path.suffix}'
+    if not path.is_file():
+        return None, f'词典文件不存在：{raw_path}'
+    
+    return path, None
+
+def save_uploaded_dictionary(upload):
+    """保存上传的词典（按内容哈希命名），返回 (路径, 错误信息)"""
+    suffix = Path(upload.filename or '').suffix.lower()
+    if suffix not in DICTIONARY_SUFFIXES:
+        return None, f'不支持的词典格式：{suffix or "未知"}'
+    
+    content = upload.read()
+    if not content:
+        return None, '上传的词典文件为空'
+    
+    UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    path = UPLOAD_DIR / f"{hashlib.sha256(content).hexdigest()[:16]}{suffix}"
+    if not path.exists():
+        path.write_bytes(content)
+    
+    return path, None
+
 @app.route('/api/batch', methods=['POST'])
 def batch_generate():
     """批量生成短名称"""
     global processor
     
+    if request.mimetype in NDJSON_MIMETYPES:
+        return batch_generate_ndjson()
+    
     data = request.get_json()
     descriptions = data.get('descriptions', [])
     
@@ -287,33 +746,213 @@ def batch_generate():
     if processor is None:
         init_processor()
     
-    results = []
-    for desc in descriptions:
-        try:
-            result = processor.process_full_description(desc)
-            results.append({
-                'original': desc,
-                'short_name': result['short_name'],
-                'success': result['success'],
-                'character_count': result['character_count']
-            })
-        except Exception as e:
-            results.append({
-                'original': desc,
-                'short_name': '',
-                'success': False,
-                'error': str(e)
-            })
+    if not isinstance(descriptions, list) or not all(isinstance(d, str) for d in descriptions):
+        return jsonify({
+            'success': False,
+            'error': 'descriptions 必须是字符串列表'
+        }), 400
+    
+    BATCH_SIZE.observe(len(descriptions), 'json')
+    
+    # 相同描述只处理一次，结果再按原顺序展开
+    unique_descriptions = list(dict.fromkeys(descriptions))
+    # 只读取一次全局引用，整个批次使用同一个处理器
+    unique_results = process_unique(processor, unique_descriptions)
+    results_by_description = dict(zip(unique_descriptions, unique_results))
+    results = [results_by_description[desc]._asdict() for desc in descriptions]
     
     return jsonify({
         'success': True,
         'count': len(results),
+        'unique_count': len(unique_descriptions),
+        'deduplicated': len(descriptions) - len(unique_descriptions),
         'results': results
     })
 
-# 应用启动时初始化
+def process_unique(current, descriptions):
+    """处理去重后的描述列表，启用结果库时只计算库中没有的描述"""
+    if result_store is None:
+        return compute_unique(current, descriptions)
+    
+    # 指纹包含规则和词典内容，热加载新词典后旧结果自然不再命中
+    fingerprint = current.fingerprint()
+    found = result_store.get_many(fingerprint, descriptions)
+    missing = [desc for desc in descriptions if desc not in found]
+    if missing:
+        computed = compute_unique(current, missing)
+        result_store.put_many(fingerprint, computed)
+        found.update(zip(missing, computed))
+    
+    return [found[desc] for desc in descriptions]
+
+def compute_unique(current, descriptions):
+    """计算去重后的描述列表，大批量时分块交给进程池并行处理
+    
+    批量接口只返回短名称，使用精简模式跳过组件分解。
+    """
+    if BATCH_WORKERS > 1 and len(descriptions) >= BATCH_PARALLEL_THRESHOLD:
+        engine = get_batch_engine(current.dictionary)
+        try:
+            return engine.process_batch(descriptions, detailed=False)
+        except RuntimeError as e:
+            # 进程池已关闭或崩溃（BrokenProcessPool 也是 RuntimeError），退回单线程处理
+            print(f"⚠️ 批量进程池不可用，改为单线程处理：{e}")
+    
+    # 逐条流式处理，复用同一批次的分词器状态
+    return list(current.process_iter(descriptions, detailed=False))
+
+def get_batch_engine(dictionary):
+    """获取与当前词典一致的批量进程池，词典路径或内容变化时重建
+    
+    同一路径的词典文件被原地修改后重新加载，路径不变但内容哈希不同，也要重建。
+    """
+    global batch_engine, batch_engine_key
+    
+    key = (dictionary.loaded_from, dictionary.source_hash)
+    with batch_engine_lock:
+        if batch_engine is None or batch_engine_key != key:
+            if batch_engine is not None:
+                batch_engine.close()
+            # 把已加载的词典交给池内进程（fork 时按写时复制共享），不再各自重新读取文件
+            engine = ParallelBatchProcessor(
+                workers=BATCH_WORKERS,
+                chunk_size=BATCH_CHUNK_SIZE,
+                cache_size=RESULT_CACHE_SIZE,
+                dictionary=dictionary
+            )
+            # 池内各进程记录的阶段耗时随分块结果返回，在这里计入指标
+            enable_stage_profiling(engine)
+            batch_engine, batch_engine_key = engine, key
+        return batch_engine
+
+def batch_generate_ndjson():
+    """NDJSON 流式批处理：逐行读取请求体，每算完一条立即返回一行结果
+    
+    每行可以是 JSON 字符串，或带 description 字段的 JSON 对象。
+    支持 gzip 压缩的请求体（Content-Encoding: gzip）和响应体（Accept-Encoding: gzip）。
+    """
+    global processor
+    
+    encoding = request.headers.get('Content-Encoding', 'identity').lower()
+    if encoding not in ('identity', 'gzip'):
+        return jsonify({
+            'success': False,
+            'error': f'不支持的请求体编码：{encoding}'
+        }), 415
+    
+    if processor is None:
+        init_processor()
+    
+    # 在整个流式响应期间使用同一个处理器
+    current = processor
+    stream = gzip.GzipFile(fileobj=request.stream) if encoding == 'gzip' else request.stream
+    
+    # 先读取第一行：请求体不是有效的 gzip 数据时，在发送响应头之前返回 400
+    try:
+        first_line = stream.readline(NDJSON_MAX_LINE_BYTES + 1)
+    except GZIP_DECODE_ERRORS as e:
+        return jsonify({
+            'success': False,
+            'error': f'请求体解码失败：{e}'
+        }), 400
+    
+    def generate_lines():
+        raw_lines = _limited_lines(stream, first_line)
+        line_number = 0
+        while True:
+            # 后续数据损坏或超出大小限制时返回一行错误并结束，响应头已经发出，无法再改状态码
+            try:
+                raw_line = next(raw_lines, None)
+            except GZIP_DECODE_ERRORS as e:
+                error = f'请求体解码失败：{e}'
+            except ValueError as e:
+                error = str(e)
+            else:
+                error = None
+            if error is not None:
+                error_line = {'line': line_number + 1, 'success': False, 'error': error}
+                yield json.dumps(error_line, ensure_ascii=False).encode('utf-8') + b'\n'
+                return
+            if raw_line is None:
+                return
+            line_number += 1
+            
+            line = raw_line.strip()
+            if not line:
+                continue
+            
+            try:
+                item = json.loads(line)
+            except ValueError:
+                item = None
+            description = item.get('description') if isinstance(item, dict) else item
+            
+            if isinstance(description, str):
+                result = current.process_full_description(description, detailed=False)._asdict()
+            else:
+                result = {
+                    'line': line_number,
+                    'success': False,
+                    'error': '无效的行：需要 JSON 字符串或带 description 字段的对象'
+                }
+            
+            yield json.dumps(result, ensure_ascii=False).encode('utf-8') + b'\n'
+    
+    lines = _count_batch_lines(generate_lines(), 'ndjson')
+    headers = {'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.headers.get('Accept-Encoding', '').lower():
+        lines = _gzip_chunks(lines, NDJSON_GZIP_FLUSH_LINES)
+        headers['Content-Encoding'] = 'gzip'
+    
+    return Response(stream_with_context(lines), mimetype='application/x-ndjson', headers=headers)
+
+def _limited_lines(stream, first_line):
+    """逐行读取请求体，每次最多读取 NDJSON_MAX_LINE_BYTES + 1 字节
+    
+    单行超长或累计读取超过 NDJSON_MAX_BODY_BYTES 时抛出 ValueError。
+    gzip 请求体按需解压，内存占用不超过一行的上限。
+    """
+    line = first_line
+    total = 0
+    while line:
+        total += len(line)
+        if len(line) > NDJSON_MAX_LINE_BYTES and not line.endswith(b'\n'):
+            raise ValueError(f'行长度超过 {NDJSON_MAX_LINE_BYTES} 字节')
+        if total > NDJSON_MAX_BODY_BYTES:
+            raise ValueError(f'请求体（解压后）超过 {NDJSON_MAX_BODY_BYTES} 字节')
+        yield line
+        line = stream.readline(NDJSON_MAX_LINE_BYTES + 1)
+
+def _count_batch_lines(lines, mode):
+    """透传结果行，流结束（或客户端断开）时记录批量大小"""
+    count = 0
+    try:
+        for line in lines:
+            count += 1
+            yield line
+    finally:
+        BATCH_SIZE.observe(count, mode)
+
+def _gzip_chunks(chunks, flush_every):
+    """把数据块流压缩为 gzip 流，每 flush_every 块输出一次可解压的数据"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 = gzip 格式
+    
+    for count, chunk in enumerate(chunks, 1):
+        data = compressor.compress(chunk)
+        if count % flush_every == 0:
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    
+    yield compressor.flush()
+
+# 应用启动时初始化（gunicorn preload_app 时在主进程中运行，worker 通过 fork 共享）
 with app.app_context():
     init_processor()
+    # 预先编译规则（和结果库指纹），fork 前构建好，worker 不再各自构建
+    processor.rules.compiled()
+    if result_store is not None:
+        processor.fingerprint()
 
 if __name__ == '__main__':
     # Azure App Service使用环境变量PORT
@@ -5,12 +5,24 @@ Canadian Medical Product Short Name Generator - Gradio App
 
 import gradio as gr
 import pandas as pd
+import os
+import tempfile
+import time
+from itertools import tee
 from pathlib import Path
-from processor import CorrectedShortNameProcessor
+from processor import CorrectedShortNameProcessor, CatalogWriter, OUTPUT_COLUMNS, catalog_output_row, iter_catalog_rows
 
 # 全局变量存储处理器
 processor = None
 
+# 队列：同时运行的事件数和排队上限
+QUEUE_CONCURRENCY = int(os.environ.get('GRADIO_CONCURRENCY', 4))
+QUEUE_MAX_SIZE = int(os.environ.get('GRADIO_QUEUE_SIZE', 64))
+# 单条生成事件合并成批：并发用户的请求最多合并这么多条一起处理
+MAX_BATCH_SIZE = int(os.environ.get('GRADIO_MAX_BATCH_SIZE', 16))
+# 批量文件处理：每处理多少行返回一次部分结果
+CATALOG_YIELD_ROWS = 1000
+
 def load_dictionary(file_obj):
     """加载词典文件"""
     global processor
@@ -36,25 +48,37 @@ def load_dictionary(file_obj):
     except Exception as e:
         return f"❌ 加载失败：{str(e)}", None
 
-def process_description(full_description):
-    """处理产品描述"""
+def get_processor():
+    """返回当前处理器，尚未加载时尝试使用默认词典"""
     global processor
     
-    if not full_description:
-        return "请输入产品描述", "", None, []
-    
     if processor is None:
-        # 尝试使用默认词典
         default_path = str(Path(__file__).parent / "data" / "dictionary.xlsx")
         if Path(default_path).exists():
             processor = CorrectedShortNameProcessor(default_path)
-        else:
-            return "❌ 请先加载词典文件！", "", None, []
+    return processor
+
+def process_descriptions(descriptions):
+    """批量模式的事件处理函数：队列把并发用户的请求合并成一批传入
+    
+    每个输出组件返回一个与输入等长的列表。
+    """
+    current = get_processor()
+    outputs = []
     
-    # 处理输入
-    result = processor.process_full_description(full_description)
+    if current is None:
+        outputs = [("❌ 请先加载词典文件！", "", None, []) for _ in descriptions]
+    else:
+        # 同一批次复用一个分词器，空输入不参与处理
+        valid = [desc for desc in descriptions if desc]
+        results = iter(current.process_iter(valid))
+        for desc in descriptions:
+            outputs.append(format_result(next(results)) if desc else ("请输入产品描述", "", None, []))
     
-    # 准备输出
+    return [list(column) for column in zip(*outputs)]
+
+def format_result(result):
+    """把详细结果转换为界面各输出组件的值"""
     status = "✅ 生成成功" if result['success'] else "❌ 生成失败"
     short_name = result['short_name']
     char_info = f"字符数：{result['character_count']}/35"
@@ -84,6 +108,65 @@ def process_description(full_description):
     
     return status, f"{short_name}\n\n{char_info}", df_components, messages
 
+def process_catalog(file_obj, column):
+    """批量处理上传的产品目录，边处理边返回部分结果，最后返回可下载的结果文件"""
+    if file_obj is None:
+        yield "请上传产品目录文件", None, None
+        return
+    
+    current = get_processor()
+    if current is None:
+        yield "❌ 请先加载词典文件！", None, None
+        return
+    
+    try:
+        rows = iter_catalog_rows(file_obj.name)
+        header = next(rows, None)
+    except (OSError, ValueError) as e:
+        yield f"❌ 目录文件读取失败：{str(e)}", None, None
+        return
+    
+    if header is None:
+        yield "❌ 目录文件为空", None, None
+        return
+    
+    names = [str(name).strip() for name in header]
+    column = (column or '').strip()
+    if column and column not in names:
+        yield f"❌ 找不到列：{column}（可用列：{', '.join(names)}）", None, None
+        return
+    col = names.index(column) if column else 0
+    
+    source = Path(file_obj.name)
+    output_path = Path(tempfile.mkdtemp()) / f"{source.stem}_short{source.suffix}"
+    
+    # 结果逐行写入输出文件，只保留当前这一批用于界面显示
+    rows, pending_rows = tee(rows)
+    descriptions = (str(row[col]) if col < len(row) else '' for row in rows)
+    preview = []
+    count = 0
+    started = time.perf_counter()
+    
+    with CatalogWriter(str(output_path)) as writer:
+        writer.write_row(list(header) + OUTPUT_COLUMNS)
+        
+        for row, result in zip(pending_rows, current.process_iter(descriptions, detailed=False)):
+            writer.write_row(catalog_output_row(row, len(header), result))
+            preview.append([result.original, result.short_name, '✅' if result.success else '❌'])
+            count += 1
+            
+            if count % CATALOG_YIELD_ROWS == 0:
+                rate = count / (time.perf_counter() - started)
+                yield f"处理中：已完成 {count:,} 行（{rate:,.0f} 行/秒）", catalog_preview(preview), None
+                preview = []
+    
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    yield f"✅ 完成：共 {count:,} 行，用时 {elapsed:.1f} 秒（{rate:,.0f} 行/秒）", catalog_preview(preview), str(output_path)
+
+def catalog_preview(rows):
+    return pd.DataFrame(rows, columns=['产品描述', '短名称', '状态'])
+
 # 示例数据
 examples = [
     ["Solution Dextrose 5% 500 milliliters Bottle Viaflex Non-Latex"],
@@ -156,6 +239,30 @@ with gr.Blocks(title="医疗产品短名称生成器", theme=gr.themes.Soft()) a
             
             messages_output = gr.JSON(label="处理消息")
     
+    # 批量文件处理
+    with gr.Accordion("📦 批量处理产品目录", open=False):
+        gr.Markdown("上传 CSV 或 Excel 产品目录，处理过程中逐批显示最新结果，完成后可下载追加了短名称的结果文件。")
+        
+        with gr.Row():
+            catalog_file = gr.File(
+                label="上传产品目录",
+                file_types=[".csv", ".xlsx"],
+                type="file"
+            )
+            with gr.Column():
+                catalog_column = gr.Textbox(
+                    label="产品描述所在列",
+                    placeholder="列名，留空使用第一列"
+                )
+                catalog_btn = gr.Button("🚀 开始批量处理", variant="primary")
+        
+        catalog_status = gr.Textbox(label="处理进度", interactive=False)
+        catalog_results = gr.Dataframe(
+            label="最新一批结果",
+            headers=["产品描述", "短名称", "状态"]
+        )
+        catalog_output = gr.File(label="下载结果")
+    
     # 规则说明
     with gr.Accordion("📏 命名规则说明", open=False):
         gr.Markdown("""
@@ -181,11 +288,23 @@ with gr.Blocks(title="医疗产品短名称生成器", theme=gr.themes.Soft()) a
         outputs=[dict_status, dict_preview]
     )
     
+    # 批量模式：队列把等待中的多个请求合并后一次调用 process_descriptions
     process_btn.click(
-        fn=process_description,
+        fn=process_descriptions,
         inputs=input_text,
-        outputs=[status_output, result_output, components_output, messages_output]
+        outputs=[status_output, result_output, components_output, messages_output],
+        batch=True,
+        max_batch_size=MAX_BATCH_SIZE
     )
+    
+    catalog_btn.click(
+        fn=process_catalog,
+        inputs=[catalog_file, catalog_column],
+        outputs=[catalog_status, catalog_results, catalog_output]
+    )
+
+# 启用队列：控制并发、排队请求，批量模式和流式返回都依赖队列
+demo.queue(concurrency_count=QUEUE_CONCURRENCY, max_size=QUEUE_MAX_SIZE)
 
 # 启动应用
 if __name__ == "__main__":
@@ -5,7 +5,12 @@ Canadian Medical Product Short Name Generator - Streamlit App
 
 import streamlit as st
 import pandas as pd
+from collections import OrderedDict, deque
+from io import BytesIO
 from pathlib import Path
+import hashlib
+import threading
+import time
 import sys
 import os
 
@@ -19,6 +24,101 @@ except ImportError:
     st.error("请确保 processor.py 文件在同一目录下")
     st.stop()
 
+# 跨会话缓存的处理器数量（每个不同内容的词典一个）
+PROCESSOR_CACHE_SIZE = int(os.environ.get('PROCESSOR_CACHE_SIZE', 4))
+
+# 处理历史最多保留的条数（超出后丢弃最早的记录）
+HISTORY_SIZE = 200
+
+# 批量处理：每处理多少行刷新一次进度条
+BULK_PROGRESS_EVERY = 500
+
+class ProcessorCache:
+    """跨会话共享的处理器 LRU 缓存，以词典内容的 SHA-256 为键
+    
+    相同内容的词典只解析一次，所有会话共用同一个处理器；
+    超出容量时淘汰最久未使用的处理器。
+    """
+    
+    def __init__(self, max_size):
+        self.max_size = max(1, max_size)
+        self._processors = OrderedDict()
+        self._lock = threading.Lock()
+        # 每个正在加载的词典一把锁：只有等待同一词典的会话会阻塞
+        self._loading = {}
+    
+    def get(self, digest, load):
+        """返回 digest 对应的处理器，不存在时调用 load() 创建；load 返回 None 表示加载失败"""
+        with self._lock:
+            processor = self._lookup(digest)
+            if processor is not None:
+                return processor
+            loading = self._loading.setdefault(digest, threading.Lock())
+        
+        # 在全局锁外加载：解析大词典时其他会话（包括使用其他词典的会话）不受影响，
+        # 多个会话同时上传同一词典时只解析一次
+        with loading:
+            with self._lock:
+                processor = self._lookup(digest)
+                if processor is not None:
+                    return processor
+            
+            processor = load()
+            with self._lock:
+                if processor is not None:
+                    self._processors[digest] = processor
+                    while len(self._processors) > self.max_size:
+                        self._processors.popitem(last=False)
+                self._loading.pop(digest, None)
+            return processor
+    
+    def _lookup(self, digest):
+        """查找已缓存的处理器并标记为最近使用（调用前必须持有 self._lock）"""
+        processor = self._processors.get(digest)
+        if processor is not None:
+            self._processors.move_to_end(digest)
+        return processor
+
+@st.cache_resource
+def get_processor_cache():
+    """整个 Streamlit 进程共用一个缓存实例"""
+    return ProcessorCache(PROCESSOR_CACHE_SIZE)
+
+def load_processor_from_upload(data, filename):
+    """直接从上传的内容加载词典，不写临时文件"""
+    processor = CorrectedShortNameProcessor()
+    if not processor.dictionary.load_from_bytes(data, filename):
+        return None
+    processor.rules.compiled()
+    return processor
+
+def load_processor_from_path(path):
+    processor = CorrectedShortNameProcessor()
+    if not processor.dictionary.load_from_file(path):
+        return None
+    processor.rules.compiled()
+    return processor
+
+def read_catalog(catalog_file):
+    """解析上传的产品目录，返回 (DataFrame, 内容哈希)
+    
+    结果按上传文件的 file_id 保存在会话中，其他控件触发的重新运行不再重复解析和计算哈希。
+    """
+    cached = st.session_state.catalog
+    if cached is None or cached['file_id'] != catalog_file.file_id:
+        catalog_data = catalog_file.getvalue()
+        if catalog_file.name.lower().endswith('.csv'):
+            df_catalog = pd.read_csv(BytesIO(catalog_data), dtype=str, keep_default_na=False)
+        else:
+            df_catalog = pd.read_excel(BytesIO(catalog_data), dtype=str).fillna('')
+        
+        cached = st.session_state.catalog = {
+            'file_id': catalog_file.file_id,
+            'df': df_catalog,
+            'digest': hashlib.sha256(catalog_data).hexdigest()
+        }
+    return cached['df'], cached['digest']
+
 # 设置页面配置
 st.set_page_config(
     page_title="医疗产品短名称生成器",
@@ -30,7 +130,12 @@ st.set_page_config(
 if 'processor' not in st.session_state:
     st.session_state.processor = None
 if 'history' not in st.session_state:
-    st.session_state.history = []
+    # 有界缓冲区，保存已格式化好的表格行（最新的在前），重新运行时无需重建
+    st.session_state.history = deque(maxlen=HISTORY_SIZE)
+if 'bulk_output' not in st.session_state:
+    st.session_state.bulk_output = None
+if 'catalog' not in st.session_state:
+    st.session_state.catalog = None
 
 # 标题和说明
 st.title("🏥 加拿大医疗产品短名称生成器")
@@ -54,31 +159,42 @@ with st.sidebar:
     )
     
     if uploaded_file is not None:
-        # 保存上传的文件
-        save_path = f"temp_{uploaded_file.name}"
-        with open(save_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
+        # 按内容哈希从跨会话缓存中取处理器，相同词典不会重复解析
+        data = uploaded_file.getvalue()
+        digest = hashlib.sha256(data).hexdigest()
         
-        # 加载词典
         try:
-            st.session_state.processor = CorrectedShortNameProcessor(save_path)
-            st.success(f"✅ 词典加载成功！共{len(st.session_state.processor.dictionary.abbreviations)}个缩写")
-            
-            # 显示部分词典内容
-            with st.expander("查看词典示例"):
-                dict_items = list(st.session_state.processor.dictionary.abbreviations.items())[:10]
-                df_dict = pd.DataFrame(dict_items, columns=['完整词汇', '缩写'])
-                st.dataframe(df_dict)
+            processor = get_processor_cache().get(
+                digest, lambda: load_processor_from_upload(data, uploaded_file.name)
+            )
+            if processor is None:
+                st.error("❌ 词典加载失败：请检查文件格式（第一列为完整词汇，第二列为缩写）")
+            else:
+                st.session_state.processor = processor
+                st.success(f"✅ 词典加载成功！共{len(processor.dictionary.abbreviations)}个缩写")
+                
+                # 显示部分词典内容
+                with st.expander("查看词典示例"):
+                    dict_items = list(processor.dictionary.abbreviations.items())[:10]
+                    df_dict = pd.DataFrame(dict_items, columns=['完整词汇', '缩写'])
+                    st.dataframe(df_dict)
         except Exception as e:
             st.error(f"❌ 词典加载失败：{str(e)}")
     else:
         # 使用默认词典路径
-        default_dict_path = str(Path(__file__).parent / "data" / "dictionary.xlsx")
-        if Path(default_dict_path).exists():
+        default_dict_path = Path(__file__).parent / "data" / "dictionary.xlsx"
+        if default_dict_path.exists():
             if st.button("使用默认词典"):
                 try:
-                    st.session_state.processor = CorrectedShortNameProcessor(default_dict_path)
-                    st.success("✅ 默认词典加载成功！")
+                    digest = hashlib.sha256(default_dict_path.read_bytes()).hexdigest()
+                    processor = get_processor_cache().get(
+                        digest, lambda: load_processor_from_path(str(default_dict_path))
+                    )
+                    if processor is None:
+                        st.error("❌ 默认词典加载失败")
+                    else:
+                        st.session_state.processor = processor
+                        st.success("✅ 默认词典加载成功！")
                 except Exception as e:
                     st.error(f"❌ 默认词典加载失败：{str(e)}")
         else:
@@ -156,10 +272,10 @@ with col2:
                 result = st.session_state.processor.process_full_description(full_description)
                 
                 # 添加到历史记录
-                st.session_state.history.append({
-                    'input': full_description,
-                    'output': result['short_name'],
-                    'success': result['success']
+                st.session_state.history.appendleft({
+                    '输入': full_description,
+                    '输出': result['short_name'],
+                    '状态': '✅ 成功' if result['success'] else '❌ 失败'
                 })
                 
                 # 显示结果
@@ -202,24 +318,103 @@ with col2:
     if clear_btn:
         st.rerun()
 
+# 批量处理
+st.divider()
+st.header("📦 批量处理")
+
+catalog_file = st.file_uploader(
+    "上传产品目录文件",
+    type=['csv', 'xlsx'],
+    help="CSV或Excel文件，每行一个产品，结果会追加 short_name / success / character_count 三列",
+    key="catalog_file"
+)
+
+if catalog_file is not None:
+    try:
+        df_catalog, catalog_digest = read_catalog(catalog_file)
+    except Exception as e:
+        st.error(f"❌ 目录文件读取失败：{str(e)}")
+        df_catalog = None
+    
+    if df_catalog is not None:
+        description_column = st.selectbox("产品描述所在列", list(df_catalog.columns))
+        st.caption(f"共 {len(df_catalog):,} 行")
+        
+        # 目录内容、描述列或词典变化后，之前的结果不再显示
+        current_processor = st.session_state.processor
+        bulk_key = (
+            catalog_digest,
+            description_column,
+            current_processor.dictionary.source_hash if current_processor else None
+        )
+        
+        if st.button("🚀 开始批量处理", type="primary"):
+            if st.session_state.processor is None:
+                st.error("❌ 请先加载词典！")
+            else:
+                descriptions = df_catalog[description_column].astype(str).tolist()
+                total = len(descriptions)
+                progress_bar = st.progress(0.0, text="处理中...")
+                status_text = st.empty()
+                
+                # 逐条流式处理，每隔一批刷新进度和吞吐量
+                results = []
+                started = time.perf_counter()
+                for result in st.session_state.processor.process_iter(descriptions, detailed=False):
+                    results.append(result)
+                    done = len(results)
+                    if done % BULK_PROGRESS_EVERY == 0 or done == total:
+                        elapsed = time.perf_counter() - started
+                        progress_bar.progress(done / total, text=f"已处理 {done:,} / {total:,} 行")
+                        status_text.markdown(f"**吞吐量：** {done / elapsed:,.0f} 行/秒" if elapsed > 0 else "")
+                
+                df_output = df_catalog.copy()
+                df_output['short_name'] = [r.short_name for r in results]
+                df_output['success'] = [r.success for r in results]
+                df_output['character_count'] = [r.character_count for r in results]
+                
+                # 生成与上传格式相同的下载文件，保存在会话中，点击下载触发重新运行时无需重算
+                stem = Path(catalog_file.name).stem
+                if catalog_file.name.lower().endswith('.csv'):
+                    output_data = df_output.to_csv(index=False).encode('utf-8-sig')
+                    output_name, output_mime = f"{stem}_short.csv", 'text/csv'
+                else:
+                    buffer = BytesIO()
+                    df_output.to_excel(buffer, index=False)
+                    output_data = buffer.getvalue()
+                    output_name = f"{stem}_short.xlsx"
+                    output_mime = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+                
+                st.session_state.bulk_output = {
+                    'key': bulk_key,
+                    'data': output_data,
+                    'name': output_name,
+                    'mime': output_mime,
+                    'rows': total,
+                    'failed': sum(1 for r in results if not r.success)
+                }
+        
+        bulk_output = st.session_state.bulk_output
+        if bulk_output is not None and bulk_output['key'] == bulk_key:
+            st.success(f"✅ 已完成 {bulk_output['rows']:,} 行，其中 {bulk_output['failed']:,} 行未通过校验")
+            st.download_button(
+                "📥 下载结果",
+                data=bulk_output['data'],
+                file_name=bulk_output['name'],
+                mime=bulk_output['mime']
+            )
+
 # 历史记录
 st.divider()
 st.header("📜 处理历史")
 
 if st.session_state.history:
-    # 创建历史记录表格
-    df_history = pd.DataFrame(st.session_state.history)
-    df_history['状态'] = df_history['success'].map({True: '✅ 成功', False: '❌ 失败'})
-    df_history = df_history[['input', 'output', '状态']].rename(columns={
-        'input': '输入',
-        'output': '输出'
-    })
-    
-    st.dataframe(df_history, use_container_width=True)
+    # 历史记录已是格式化好的行，直接显示
+    st.dataframe(list(st.session_state.history), use_container_width=True)
     
     # 清除历史按钮
     if st.button("🗑️ 清除历史"):
-        st.session_state.history = []
+        st.session_state.history.clear()
         st.rerun()
 else:
     st.info("暂无处理历史")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Allocation benchmark for the tokenize/build hot loop
+
+Runs StrictTokenizer.tokenize and _build_components_strict over a seeded
+catalog and reports wall time, peak traced memory, and memory retained per
+description when all tokens and components are kept alive.
+
+Usage: python benchmarks/bench_memory.py [--count N] [--seed S]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from catalog import generate_descriptions  # Also puts the repository root on sys.path
+from processor import CorrectedShortNameProcessor, StrictTokenizer
+
+
+def run(descriptions, processor, keep):
+    """Tokenize and build every description, optionally retaining the objects"""
+    retained = []
+    for description in descriptions:
+        tokenizer = StrictTokenizer(processor.rules)
+        tokens = tokenizer.tokenize(description, processor.dictionary.phrases)
+        components = processor._build_components_strict(tokens, tokenizer)
+        if keep:
+            retained.append((tokens, components))
+    return retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokenize/build allocation benchmark")
+    parser.add_argument('--count', type=int, default=20000, help="Descriptions to process")
+    parser.add_argument('--seed', type=int, default=42, help="Catalog generator seed")
+    args = parser.parse_args()
+    
+    descriptions = generate_descriptions(args.count, args.seed)
+    processor = CorrectedShortNameProcessor()
+    run(descriptions[:100], processor, keep=False)  # Warm up compiled rules
+    
+    gc.collect()
+    started = time.perf_counter()
+    run(descriptions, processor, keep=False)
+    elapsed = time.perf_counter() - started
+    
+    gc.collect()
+    tracemalloc.start()
+    run(descriptions, processor, keep=False)
+    _, streaming_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    
+    baseline, _ = tracemalloc.get_traced_memory()
+    retained = run(descriptions, processor, keep=True)
+    current, retained_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    print(f"descriptions:            {args.count:,}")
+    print(f"tokenize+build time:     {elapsed:.3f}s ({args.count / elapsed:,.0f}/s)")
+    print(f"streaming peak memory:   {streaming_peak / 1024:,.1f} KiB")
+    print(f"retained peak memory:    {retained_peak / 1024 / 1024:,.2f} MiB")
+    print(f"retained per description: {(current - baseline) / len(retained):,.0f} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Seeded synthetic catalog generator for the benchmarks
+
+Descriptions are assembled from the ShortNameRules vocabularies plus sizes,
+percentages, product codes and free-text words, so every tokenizer branch
+is exercised in realistic proportions. Dictionaries of any size are built
+the same way: the vocabulary and free-text words first (so lookups hit),
+then multi-word phrases and synthetic filler terms.
+"""
+
+import csv
+import random
+import string
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from processor import ShortNameRules
+
+FREE_WORDS = [
+    'Mayo', 'Foley', 'Straight', 'Curved', 'Balloon', 'Silicone', 'Latex-Free',
+    'Non-Latex', 'Taper', 'Blunt', 'Dextrose', 'Saline', 'Nitrile', 'Vinyl',
+    'Blue', 'White', 'Green', 'Lid', 'Tip', 'Size',
+]
+SIZE_UNITS = ['mm', 'cm', 'm', 'ml', 'L', 'mg', 'g', 'kg', 'in', 'ft', 'oz', 'Fr', 'ga']
+
+
+def generate_descriptions(count: int, seed: int = 42) -> List[str]:
+    """Generate `count` reproducible product descriptions"""
+    rules = ShortNameRules()
+    rng = random.Random(seed)
+    
+    product_types = sorted(rules.PRODUCT_TYPES)
+    modifiers = sorted(
+        rules.COMMON_BRANDS | rules.DESCRIPTIVE_TERMS | rules.SEASONAL_TERMS
+        | rules.PACKAGING_MATERIALS | set(rules.SIDE_INDICATORS)
+    )
+    stopwords = sorted(rules.STOPWORDS)
+    
+    descriptions = []
+    for _ in range(count):
+        words = [rng.choice(product_types).capitalize()]
+        for _ in range(rng.randint(2, 9)):
+            roll = rng.random()
+            if roll < 0.35:
+                words.append(rng.choice(modifiers))
+            elif roll < 0.55:
+                words.append(f"{rng.choice([1, 2.5, 5, 10, 16, 100, 500])}{rng.choice(SIZE_UNITS)}")
+            elif roll < 0.62:
+                words.append(f"{rng.choice([0.9, 5, 10, 70])}%")
+            elif roll < 0.68:
+                words.append(f"{rng.choice('ABCJKX')}{rng.randint(10, 9999)}")
+            elif roll < 0.75:
+                words.append(rng.choice(stopwords))
+            else:
+                words.append(rng.choice(FREE_WORDS))
+        
+        rng.shuffle(words)
+        descriptions.append(' '.join(words))
+    
+    return descriptions
+
+
+def generate_dictionary(size: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """Generate `size` reproducible (full term, abbreviation) dictionary entries"""
+    rules = ShortNameRules()
+    rng = random.Random(seed)
+    
+    real_terms = sorted(
+        rules.COMMON_BRANDS | rules.DESCRIPTIVE_TERMS | rules.SEASONAL_TERMS
+        | rules.PACKAGING_MATERIALS | {word.lower() for word in FREE_WORDS}
+    )
+    terms = list(dict.fromkeys(real_terms))[:size]
+    seen = set(terms)
+    
+    # About one entry in ten is a multi-word phrase, as in real dictionaries
+    while len(terms) < size:
+        if rng.random() < 0.1:
+            term = f"{rng.choice(real_terms)} {rng.choice(real_terms)}"
+        else:
+            term = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+        if term not in seen:
+            seen.add(term)
+            terms.append(term)
+    
+    return [(term, abbreviate(term)) for term in terms]
+
+
+def abbreviate(term: str) -> str:
+    """Abbreviate each word to its first letter and following consonants, at most 4 letters"""
+    parts = []
+    for word in term.split():
+        consonants = [c for c in word[1:] if c.isalpha() and c not in 'aeiou']
+        parts.append((word[0] + ''.join(consonants))[:4].upper())
+    return ' '.join(parts)
+
+
+def write_dictionary_csv(path: Path, entries: List[Tuple[str, str]]):
+    """Write dictionary entries in the two-column layout AbbreviationDictionary loads"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Full Term', 'Abbreviation'])
+        writer.writerows(entries)
+
+
+def write_dictionary_xlsx(path: Path, entries: List[Tuple[str, str]]):
+    """Write dictionary entries as an Excel workbook, the format most dictionaries ship in"""
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['Full Term', 'Abbreviation'])
+    for entry in entries:
+        sheet.append(entry)
+    workbook.save(path)
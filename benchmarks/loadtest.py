@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+HTTP load test for the Flask API
+
+Starts app_flask under gunicorn (using gunicorn.conf.py) or the werkzeug
+development server with a synthetic dictionary, then drives /api/generate
+and /api/batch from concurrent client threads for a fixed duration and
+reports throughput, p50/p95/p99 latency and error rates per endpoint.
+The started server runs with its result cache off (--cache-size 0) so the
+run measures processing rather than cache hits. Pass --url to load an
+already running server instead.
+
+Usage: python benchmarks/loadtest.py [--server gunicorn|werkzeug] [--workers N]
+                                     [--concurrency N] [--duration S]
+                                     [--batch-ratio R] [--batch-size N] [--cache-size N]
+                                     [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from catalog import generate_descriptions, generate_dictionary, write_dictionary_csv  # Also puts the repository root on sys.path
+from run import REPO_ROOT, percentile
+
+READY_TIMEOUT = 60
+
+
+def start_server(args, dictionary_dir: Path) -> subprocess.Popen:
+    """Start app_flask in a subprocess and wait until /api/status answers"""
+    env = dict(os.environ, DICTIONARY_DIR=str(dictionary_dir),
+               SHORTNAME_SNAPSHOT_DIR=str(dictionary_dir / 'snapshots'),
+               RESULT_CACHE_SIZE=str(args.cache_size))
+    # A persistent result store would serve repeated descriptions like the cache
+    env.pop('RESULT_STORE_PATH', None)
+
+    if args.server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                   '-w', str(args.workers), '-b', f'{args.host}:{args.port}', 'app_flask:app']
+    else:
+        command = [sys.executable, '-c',
+                   f'from app_flask import app; app.run(host={args.host!r}, port={args.port}, threaded=True)']
+
+    server = subprocess.Popen(command, cwd=REPO_ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"{args.server} exited with status {server.returncode} during startup")
+        try:
+            with urllib.request.urlopen(f'{base_url(args)}/api/status', timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.1)
+
+    stop_server(server)
+    raise RuntimeError(f"{args.server} did not answer within {READY_TIMEOUT}s")
+
+
+def stop_server(server: subprocess.Popen):
+    server.terminate()
+    try:
+        server.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def base_url(args) -> str:
+    return args.url.rstrip('/') if args.url else f'http://{args.host}:{args.port}'
+
+
+def server_cache_size(url: str, timeout: float) -> Optional[int]:
+    """Result cache capacity reported by /api/status (0 when off), None if unavailable"""
+    try:
+        with urllib.request.urlopen(f'{url}/api/status', timeout=timeout) as response:
+            cache = json.load(response).get('cache')
+    except (OSError, ValueError):
+        return None
+    return cache['max_size'] if cache else 0
+
+
+def post_json(url: str, payload: Dict, timeout: float) -> bool:
+    """POST a JSON body and read the full response; False on HTTP or connection errors.
+    
+    A 200 response whose short name failed validation is not an error.
+    """
+    request = urllib.request.Request(url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return True
+    except OSError:  # URLError, HTTPError and timeouts are all OSErrors
+        return False
+
+
+def client(args, url: str, descriptions: List[str], seed: int, started: float, samples: List):
+    """One client thread: send requests back to back until the run ends"""
+    rng = random.Random(seed)
+    warmup_end = started + args.warmup
+    stop_at = warmup_end + args.duration
+
+    while True:
+        if rng.random() < args.batch_ratio:
+            kind = 'batch'
+            payload = {'descriptions': rng.sample(descriptions, args.batch_size)}
+        else:
+            kind = 'generate'
+            payload = {'description': rng.choice(descriptions)}
+
+        start = time.perf_counter()
+        ok = post_json(f'{url}/api/{kind}', payload, args.timeout)
+        end = time.perf_counter()
+
+        if end >= stop_at:
+            return
+        if start >= warmup_end:
+            samples.append((kind, end - start, ok))
+
+
+def summarize(samples: List, duration: float, batch_size: int) -> Dict[str, Dict[str, float]]:
+    """Throughput, latency percentiles (milliseconds) and error rate per endpoint"""
+    summary = {}
+    for kind in ('generate', 'batch', 'all'):
+        selected = [s for s in samples if kind == 'all' or s[0] == kind]
+        if not selected:
+            continue
+
+        latencies = sorted(latency for _, latency, _ in selected)
+        errors = sum(1 for _, _, ok in selected if not ok)
+        descriptions = sum(batch_size if k == 'batch' else 1 for k, _, ok in selected if ok)
+        summary[kind] = {
+            'requests': len(selected),
+            'errors': errors,
+            'error_rate': errors / len(selected),
+            'requests_per_s': len(selected) / duration,
+            'descriptions_per_s': descriptions / duration,
+            'p50_ms': percentile(latencies, 50) * 1e3,
+            'p95_ms': percentile(latencies, 95) * 1e3,
+            'p99_ms': percentile(latencies, 99) * 1e3,
+            'max_ms': latencies[-1] * 1e3
+        }
+    return summary
+
+
+def run_load(args, url: str) -> Dict[str, Dict[str, float]]:
+    descriptions = generate_descriptions(args.catalog_size, args.seed)
+    samples = []  # list.append is atomic, so threads share one list
+    started = time.perf_counter()
+    threads = [
+        threading.Thread(target=client, args=(args, url, descriptions, args.seed + i, started, samples), daemon=True)
+        for i in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return summarize(samples, args.duration, args.batch_size)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the Flask short name API")
+    parser.add_argument('--server', choices=['gunicorn', 'werkzeug'], default='gunicorn',
+                        help="WSGI server to start (default gunicorn)")
+    parser.add_argument('--url', help="Load an already running server instead of starting one")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=4, help="gunicorn worker processes")
+    parser.add_argument('-c', '--concurrency', type=int, default=8, help="Concurrent client threads")
+    parser.add_argument('-t', '--duration', type=float, default=20.0, help="Measured seconds")
+    parser.add_argument('--warmup', type=float, default=2.0, help="Unmeasured seconds before the run")
+    parser.add_argument('--batch-ratio', type=float, default=0.1,
+                        help="Fraction of requests sent to /api/batch (default 0.1)")
+    parser.add_argument('--batch-size', type=int, default=100, help="Descriptions per batch request")
+    parser.add_argument('--catalog-size', type=int, default=5000,
+                        help="Distinct descriptions to draw requests from")
+    parser.add_argument('--dictionary-size', type=int, default=10000, help="Synthetic dictionary entries")
+    parser.add_argument('--cache-size', type=int, default=0,
+                        help="RESULT_CACHE_SIZE of the started server (default 0, cache off)")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('-o', '--output', help="Write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.batch_size > args.catalog_size:
+        parser.error("--batch-size cannot exceed --catalog-size")
+
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.url:
+            # The service loads the dictionary named by the active-dictionary marker
+            dictionary_dir = Path(tmp)
+            dictionary_path = dictionary_dir / 'dictionary.csv'
+            write_dictionary_csv(dictionary_path, generate_dictionary(args.dictionary_size, args.seed))
+            (dictionary_dir / '.active_dictionary').write_text(
+                json.dumps({'dictionary_path': str(dictionary_path)}), encoding='utf-8')
+            server = start_server(args, dictionary_dir)
+
+        try:
+            summary = run_load(args, base_url(args))
+            # Report what the server actually ran with (with --url, its own setting)
+            cache_size = server_cache_size(base_url(args), args.timeout)
+        finally:
+            if server is not None:
+                stop_server(server)
+
+    print(f"result cache: {'unknown' if cache_size is None else cache_size or 'off'}"
+          f" ({args.catalog_size:,} distinct descriptions)\n")
+    print(f"{'endpoint':<10} {'requests':>9} {'req/s':>9} {'desc/s':>10} {'p50 ms':>9} "
+          f"{'p95 ms':>9} {'p99 ms':>9} {'errors':>8}")
+    for kind, stats in summary.items():
+        print(f"{kind:<10} {stats['requests']:>9,} {stats['requests_per_s']:>9,.1f} "
+              f"{stats['descriptions_per_s']:>10,.0f} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['p99_ms']:>9.2f} {stats['error_rate']:>8.2%}")
+
+    if args.output:
+        config = {key: value for key, value in vars(args).items() if key != 'output'}
+        config['cache_size'] = cache_size
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'config': config, 'results': summary}, f, indent=2)
+        print(f"\nresults written to {args.output}")
+
+    return 1 if not summary else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Micro and macro benchmark suite for the short name engine
+
+Measures per-call latency (p50/p95/p99) and throughput for each pipeline
+stage, dictionary loading and end-to-end processing over a seeded synthetic
+catalog, and writes the results to JSON. Passing --compare with an earlier
+results file prints the change per benchmark and exits with status 1 when
+any throughput dropped by more than --threshold.
+
+Usage: python benchmarks/run.py [--count N] [--dictionary-size N] [--output FILE]
+                                [--compare OLD.json] [--only NAME ...]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from catalog import generate_descriptions, generate_dictionary, write_dictionary_csv, write_dictionary_xlsx  # Also puts the repository root on sys.path
+from processor import AbbreviationDictionary, CorrectedShortNameProcessor, StrictTokenizer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUTPUT = Path(__file__).resolve().parent / 'results.json'
+LOAD_SIZES = (1000, 10000, 100000)
+
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    index = max(0, min(len(sorted_samples) - 1, round(q / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples: List[float], items: int) -> Dict[str, float]:
+    """Latency percentiles (microseconds) and throughput (items/second) of timed calls"""
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {
+        'calls': len(ordered),
+        'items': items,
+        'total_s': total,
+        'throughput_per_s': items / total if total else 0.0,
+        'mean_us': total / len(ordered) * 1e6,
+        'p50_us': percentile(ordered, 50) * 1e6,
+        'p95_us': percentile(ordered, 95) * 1e6,
+        'p99_us': percentile(ordered, 99) * 1e6,
+        'max_us': ordered[-1] * 1e6
+    }
+
+
+def time_calls(calls: List[Callable[[], object]], setup: Optional[Callable[[int], object]] = None) -> List[float]:
+    """Time each call separately; setup(i) runs untimed before call i"""
+    perf_counter = time.perf_counter
+    samples = []
+    gc.collect()
+    for i, call in enumerate(calls):
+        if setup is not None:
+            setup(i)
+        start = perf_counter()
+        call()
+        samples.append(perf_counter() - start)
+    return samples
+
+
+def bench_tokenize(processor, descriptions):
+    tokenizer = StrictTokenizer(processor.rules)
+    phrases = processor.dictionary.phrases
+
+    def call(description):
+        tokenizer.reset()
+        tokenizer.tokenize(description, phrases)
+
+    return time_calls([lambda d=d: call(d) for d in descriptions]), len(descriptions)
+
+
+def bench_build(processor, descriptions):
+    tokenizer = StrictTokenizer(processor.rules)
+    phrases = processor.dictionary.phrases
+    state = {}
+
+    def setup(i):
+        tokenizer.reset()
+        state['tokens'] = tokenizer.tokenize(descriptions[i], phrases)
+
+    def call():
+        processor._build_components_strict(state['tokens'], tokenizer)
+
+    return time_calls([call] * len(descriptions), setup), len(descriptions)
+
+
+def bench_validate(processor, descriptions):
+    tokenizer = StrictTokenizer(processor.rules)
+    phrases = processor.dictionary.phrases
+    built = []
+    for description in descriptions:
+        tokenizer.reset()
+        built.append(processor._build_components_strict(tokenizer.tokenize(description, phrases), tokenizer))
+
+    return time_calls([lambda c=c: processor._build_and_validate(c) for c in built]), len(built)
+
+
+def bench_end_to_end(processor, descriptions, detailed):
+    process = processor.process_full_description
+    return time_calls([lambda d=d: process(d, detailed) for d in descriptions]), len(descriptions)
+
+
+def bench_process_iter(processor, descriptions):
+    samples = time_calls([lambda: sum(1 for _ in processor.process_iter(descriptions, detailed=False))])
+    return samples, len(descriptions)
+
+
+def bench_dictionary_load(path, use_snapshot, repeat):
+    def call():
+        AbbreviationDictionary().load_from_file(str(path), use_snapshot=use_snapshot)
+
+    if use_snapshot:
+        call()  # Write the snapshot the timed loads read back
+    return time_calls([call] * repeat), repeat
+
+
+def bench_cold_import(repeat):
+    code = 'import time; t = time.perf_counter(); import processor; print(time.perf_counter() - t)'
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout
+        samples.append(float(output))
+    return samples, repeat
+
+
+def quiet(func, *args):
+    """Run func with stdout silenced (the dictionary loader prints a line per load)"""
+    saved = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        return func(*args)
+    finally:
+        sys.stdout.close()
+        sys.stdout = saved
+
+
+def run_suite(args) -> Dict[str, Dict[str, float]]:
+    descriptions = generate_descriptions(args.count, args.seed)
+    results = {}
+
+    def record(name, func, *func_args):
+        if args.only and not any(pattern in name for pattern in args.only):
+            return
+        samples, items = quiet(func, *func_args)
+        results[name] = summarize(samples, items)
+        stats = results[name]
+        decimals = 0 if stats['throughput_per_s'] >= 100 else 2  # Excel loads run well under 1/s
+        print(f"{name:<34} {stats['throughput_per_s']:>12,.{decimals}f}/s  p50 {stats['p50_us']:>10,.1f}us  "
+              f"p95 {stats['p95_us']:>10,.1f}us  p99 {stats['p99_us']:>10,.1f}us")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep snapshots out of the repository and away from earlier runs
+        os.environ['SHORTNAME_SNAPSHOT_DIR'] = str(Path(tmp) / 'snapshots')
+
+        paths = {}
+        excel_paths = {}
+        for size in sorted(set(LOAD_SIZES) | {args.dictionary_size}):
+            entries = generate_dictionary(size, args.seed)
+            paths[size] = Path(tmp) / f'dictionary_{size}.csv'
+            write_dictionary_csv(paths[size], entries)
+            if size in LOAD_SIZES:
+                excel_paths[size] = Path(tmp) / f'dictionary_{size}.xlsx'
+                write_dictionary_xlsx(excel_paths[size], entries)
+
+        processor = quiet(CorrectedShortNameProcessor, str(paths[args.dictionary_size]))
+        quiet(bench_end_to_end, processor, descriptions[:200], True)  # Warm up compiled rules
+
+        record('tokenize', bench_tokenize, processor, descriptions)
+        record('build_components', bench_build, processor, descriptions)
+        record('build_and_validate', bench_validate, processor, descriptions)
+        record('end_to_end.detailed', bench_end_to_end, processor, descriptions, True)
+        record('end_to_end.lean', bench_end_to_end, processor, descriptions, False)
+        record('end_to_end.process_iter', bench_process_iter, processor, descriptions)
+
+        for size in LOAD_SIZES:
+            repeat = max(3, args.load_repeat * 10000 // size)
+            record(f'dictionary_load.{size}.parse', bench_dictionary_load, paths[size], False, repeat)
+            record(f'dictionary_load.{size}.snapshot', bench_dictionary_load, paths[size], True, repeat)
+            # Excel goes through pandas/openpyxl, by far the slowest parse path
+            record(f'dictionary_load.{size}.xlsx.parse', bench_dictionary_load, excel_paths[size], False, repeat)
+            record(f'dictionary_load.{size}.xlsx.snapshot', bench_dictionary_load, excel_paths[size], True, repeat)
+
+    record('cold_import', bench_cold_import, args.import_repeat)
+    return results
+
+
+def environment(args) -> Dict[str, object]:
+    """Describe the run so results from different commits and machines can be told apart"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'count': args.count,
+        'seed': args.seed,
+        'dictionary_size': args.dictionary_size
+    }
+
+
+def compare(old: Dict[str, object], new: Dict[str, object], threshold: float) -> int:
+    """Print throughput and p50 changes per benchmark; return the number of regressions"""
+    old_results = old['results']
+    regressions = 0
+
+    print(f"\ncompared with {old['environment'].get('commit') or 'unknown commit'} "
+          f"({old['environment'].get('timestamp')})")
+    for name, stats in new['results'].items():
+        before = old_results.get(name)
+        if before is None:
+            print(f"{name:<34} (new)")
+            continue
+
+        change = stats['throughput_per_s'] / before['throughput_per_s'] - 1 if before['throughput_per_s'] else 0.0
+        p50_change = stats['p50_us'] / before['p50_us'] - 1 if before['p50_us'] else 0.0
+        flag = ''
+        if change < -threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"{name:<34} throughput {change:>+8.1%}  p50 {p50_change:>+8.1%}{flag}")
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Short name engine benchmark suite")
+    parser.add_argument('--count', type=int, default=20000, help="Descriptions per benchmark")
+    parser.add_argument('--seed', type=int, default=42, help="Catalog and dictionary generator seed")
+    parser.add_argument('--dictionary-size', type=int, default=10000,
+                        help="Dictionary entries for the pipeline benchmarks")
+    parser.add_argument('--load-repeat', type=int, default=20,
+                        help="Loads of the 10k dictionary (scaled inversely for other sizes)")
+    parser.add_argument('--import-repeat', type=int, default=5, help="Cold interpreter imports")
+    parser.add_argument('--only', nargs='+', help="Run only benchmarks whose name contains one of these")
+    parser.add_argument('-o', '--output', default=str(DEFAULT_OUTPUT), help="Results JSON file")
+    parser.add_argument('--compare', help="Earlier results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Throughput drop that counts as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    report = {'environment': environment(args), 'results': run_suite(args)}
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            return 1 if compare(json.load(f), report, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
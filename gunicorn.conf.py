@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for the Flask API
+
+启动：gunicorn -c gunicorn.conf.py app_flask:app
+
+主进程预加载应用（preload_app），词典与编译后的规则只构建一次，
+fork 后各 worker 以写时复制（copy-on-write）方式共享，增加 worker
+不会增加词典解析时间和内存占用。
+"""
+
+import gc
+import os
+
+bind = os.environ.get('BIND', f"0.0.0.0:{os.environ.get('PORT', 8000)}")
+# 写回环境变量，app_flask 据此按 worker 数均分批量进程池的默认进程数
+workers = int(os.environ.setdefault('WEB_CONCURRENCY', '4'))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# 在主进程中导入 app_flask，init_processor 只运行一次
+preload_app = True
+
+# 预加载期间关闭 GC：回收会改写对象头部，导致 fork 后共享页被复制
+gc.disable()
+
+
+def pre_fork(server, worker):
+    """fork 前把已有对象移入永久代，worker 中的 GC 不再扫描（改写）它们"""
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """worker 中恢复 GC，只回收 fork 之后新分配的对象"""
+    gc.enable()
@@ -7,19 +7,37 @@ Fixed version with proper duplicate prevention and dictionary usage
 import re
 import os
 import sys
+import csv
+import io
 import json
+import hashlib
+import marshal
+import time
 import argparse
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Tuple, Set, Union
+import gc
+import itertools
+import threading
+from collections import deque, OrderedDict
+from itertools import islice, tee
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Dict, Tuple, Set, Union, NamedTuple, Iterable, Iterator, Callable
 from enum import Enum
 from pathlib import Path
+from glob import escape as glob_escape
+from types import MappingProxyType
 
-# For reading Excel and CSV files
-try:
-    import pandas as pd
-except ImportError:
-    print("Please install pandas: pip install pandas openpyxl")
-    sys.exit(1)
+
+def _import_pandas():
+    """Import pandas on first use of an Excel/DataFrame code path.
+    
+    pandas and openpyxl are optional: string processing and CSV
+    dictionaries work without them, and module import stays fast.
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        raise ImportError("Please install pandas: pip install pandas openpyxl") from None
+    return pd
 
 
 class Position(Enum):
@@ -31,27 +49,67 @@ class Position(Enum):
     ADDITIONAL_DESCRIPTOR = 5  # Additional descriptor - Optional
 
 
-@dataclass
-class TokenInfo:
-    """Information about a parsed token"""
-    value: str
-    original: str
-    token_type: str
-    priority: int
-    position_hints: List[Position]
-    index: int  # Position in original text
-    is_used: bool = False
+class _SlottedRecord:
+    """Base for compact records: repr and equality derived from __slots__"""
+    __slots__ = ()
+    __hash__ = None  # Mutable records are unhashable, like dataclasses with eq
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
 
 
-@dataclass
-class ShortNameComponent:
-    """Represents a component of the short name"""
-    position: Position
-    value: str
-    original_value: str
-    is_mandatory: bool = False
-    applied_rules: List[str] = field(default_factory=list)
-    token_index: int = -1  # Track which token was used
+class TokenInfo(_SlottedRecord):
+    """Information about a parsed token.
+    
+    Slotted to keep per-token memory small; position_hints is a tuple shared
+    by all tokens of the same kind.
+    """
+    __slots__ = ('value', 'original', 'token_type', 'priority', 'position_hints', 'index', 'is_used')
+    
+    def __init__(self, value: str, original: str, token_type: str, priority: int,
+                 position_hints: Tuple[Position, ...], index: int, is_used: bool = False):
+        self.value = value
+        self.original = original
+        self.token_type = token_type
+        self.priority = priority
+        self.position_hints = position_hints
+        self.index = index  # Position in original text
+        self.is_used = is_used
+
+
+class ShortNameComponent(_SlottedRecord):
+    """Represents a component of the short name.
+    
+    applied_rules is an interned tuple shared by components built by the
+    same rule path (see rule_names).
+    """
+    __slots__ = ('position', 'value', 'original_value', 'is_mandatory', 'applied_rules', 'token_index')
+    
+    def __init__(self, position: Position, value: str, original_value: str, is_mandatory: bool = False,
+                 applied_rules: Tuple[str, ...] = (), token_index: int = -1):
+        self.position = position
+        self.value = value
+        self.original_value = original_value
+        self.is_mandatory = is_mandatory
+        self.applied_rules = applied_rules
+        self.token_index = token_index  # Track which token was used
+
+
+_rule_names: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def rule_names(*names: str) -> Tuple[str, ...]:
+    """Return the shared tuple for a sequence of applied rule names"""
+    interned = _rule_names.get(names)
+    if interned is None:
+        interned = _rule_names.setdefault(names, names)
+    return interned
 
 
 @dataclass
@@ -187,6 +245,149 @@ class ShortNameRules:
         'left': 'LT', 'right': 'RT', 'lt': 'LT', 'rt': 'RT', 
         'rl': 'RL', 'bilateral': 'BL', 'unilateral': 'UL'
     })
+    
+    # Common words that are dropped from the short name
+    STOPWORDS: Set[str] = field(default_factory=lambda: {
+        'with', 'and', 'or', 'for', 'of', 'the', 'a', 'an', 'x'
+    })
+    
+    def fingerprint(self) -> str:
+        """Stable hash of every rule setting, used to key persisted results"""
+        settings = {f.name: _canonical(getattr(self, f.name)) for f in fields(self)}
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def compiled(self) -> 'CompiledRuleset':
+        """Return the compiled lookup tables, building them on first use.
+        
+        The tables are cached on the instance, so vocabularies must not be
+        modified after the first call.
+        """
+        compiled = self.__dict__.get('_compiled')
+        if compiled is None:
+            compiled = CompiledRuleset(self)
+            self.__dict__['_compiled'] = compiled
+        return compiled
+
+
+def _canonical(value):
+    """Convert rule settings to JSON-serializable values with a fixed order"""
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canonical(item) for item in value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+class VocabEntry(NamedTuple):
+    """Precomputed classification of a lowercased vocabulary word"""
+    token_type: Optional[str]  # None marks a stopword that is skipped
+    priority: int
+    position_hints: Tuple[Position, ...]
+    value: Optional[str] = None  # Fixed replacement value (side indicators)
+    uppercase: bool = False  # Emit the word in uppercase (brands)
+
+
+class CompiledRuleset:
+    """Immutable word table and precompiled patterns built from ShortNameRules"""
+    
+    SIZE_PATTERN = re.compile(r'^(\d+\.?\d*)\s*([a-zA-Z]+)$')
+    PRODUCT_CODE_PATTERN = re.compile(r'^[A-Z]\d{2,4}[A-Z]?$')
+    
+    SIZE_HINTS = (Position.PRIMARY_VARIANT, Position.SECONDARY_VARIANT)
+    PERCENTAGE_HINTS = (Position.PRODUCT_NAME,)
+    PRODUCT_CODE_HINTS = (Position.PRIMARY_VARIANT, Position.SECONDARY_VARIANT)
+    UNCLASSIFIED_HINTS = (Position.PRODUCT_NAME, Position.SECONDARY_VARIANT)
+    PHRASE_HINTS = (Position.PRODUCT_NAME, Position.SECONDARY_VARIANT)
+    
+    def __init__(self, rules: ShortNameRules):
+        self.units = frozenset(rules.METRIC_UNITS) | frozenset(rules.IMPERIAL_UNITS)
+        
+        # Categories in tokenizer precedence order: the first category
+        # that claims a word wins
+        categories = [
+            (rules.PRODUCT_TYPES, VocabEntry('product_type', 100, (Position.PRODUCT_TYPE,))),
+            (rules.COMMON_BRANDS, VocabEntry('brand', 80, (Position.PRIMARY_VARIANT,), uppercase=True)),
+            (rules.DESCRIPTIVE_TERMS, VocabEntry('descriptor', 75, (Position.PRODUCT_NAME, Position.SECONDARY_VARIANT))),
+            (rules.SEASONAL_TERMS, VocabEntry('seasonal', 50, (Position.SECONDARY_VARIANT, Position.ADDITIONAL_DESCRIPTOR))),
+            (rules.PACKAGING_MATERIALS, VocabEntry('packaging', 60, (Position.ADDITIONAL_DESCRIPTOR,))),
+        ]
+        
+        table: Dict[str, VocabEntry] = {}
+        for words, entry in categories:
+            for word in words:
+                table.setdefault(word.lower(), entry)
+        
+        side_hints = (Position.PRIMARY_VARIANT,)
+        for word, indicator in rules.SIDE_INDICATORS.items():
+            table.setdefault(word.lower(), VocabEntry('side', 70, side_hints, value=indicator))
+        
+        stopword = VocabEntry(None, 0, ())
+        for word in rules.STOPWORDS:
+            table.setdefault(word.lower(), stopword)
+        
+        # Sizes, percentages and product codes are checked before the
+        # vocabulary, so words they would claim must stay out of the table
+        self.vocabulary = MappingProxyType({
+            word: entry for word, entry in table.items()
+            if not self._matches_pattern(word)
+        })
+    
+    def _matches_pattern(self, word: str) -> bool:
+        """Check if a word is claimed by the size, percentage or product code rules"""
+        size_match = self.SIZE_PATTERN.match(word)
+        if size_match and size_match.group(2).lower() in self.units:
+            return True
+        return '%' in word or self.PRODUCT_CODE_PATTERN.match(word.upper()) is not None
+
+
+class PhraseMatcher:
+    """Word-level trie of multi-word dictionary phrases.
+    
+    Matching walks at most `max_words` trie levels from each word, so its
+    cost depends on the description length, not on the number of phrases.
+    """
+    
+    _END = ''  # Marks a complete phrase; split() never yields empty words
+    
+    def __init__(self, phrases: Iterable[str] = ()):
+        self.root: Dict[str, dict] = {}
+        self.max_words = 0
+        self.count = 0
+        
+        for phrase in phrases:
+            words = phrase.lower().split()
+            if len(words) < 2:
+                continue
+            
+            node = self.root
+            for word in words:
+                node = node.setdefault(word, {})
+            if self._END not in node:
+                node[self._END] = True
+                self.count += 1
+            self.max_words = max(self.max_words, len(words))
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def longest_match(self, words: List[str], start: int, stop: Optional[int] = None) -> int:
+        """Return the end of the longest phrase in words[start:stop], or start if none"""
+        node = self.root
+        end = start
+        limit = min(len(words) if stop is None else stop, start + self.max_words)
+        
+        for i in range(start, limit):
+            node = node.get(words[i])
+            if node is None:
+                break
+            if self._END in node:
+                end = i + 1
+        
+        return end
 
 
 class StrictTokenizer:
@@ -195,32 +396,83 @@ class StrictTokenizer:
     def __init__(self, rules: ShortNameRules):
         self.rules = rules
         self.used_indices = set()  # Track which word indices have been used
+        # Unused-token queues per token type, in text order, filled by queue_candidates
+        self.candidates: Dict[str, deque] = {}
     
-    def tokenize(self, text: str) -> List[TokenInfo]:
-        """Tokenize text with position tracking"""
+    def tokenize(self, text: str, phrases: Optional[PhraseMatcher] = None) -> List[TokenInfo]:
+        """Tokenize text with position tracking.
+        
+        Dictionary phrases found by `phrases` become single 'phrase' tokens,
+        unless they would swallow a product type.
+        """
+        compiled = self.rules.compiled()
+        vocabulary_get = compiled.vocabulary.get
+        size_match = compiled.SIZE_PATTERN.match
+        product_code_match = compiled.PRODUCT_CODE_PATTERN.match
+        units = compiled.units
+        used_indices = self.used_indices
+        
         tokens = []
         words = text.split()
         
+        phrase_ends = self._match_phrases(words, phrases, compiled) if phrases else None
+        skip_until = 0
+        
         for i, word in enumerate(words):
-            word_lower = word.lower()
+            # Skip if already used or covered by a phrase
+            if i in used_indices or i < skip_until:
+                continue
             
-            # Skip if already used
-            if i in self.used_indices:
+            # Dictionary phrases take precedence over their individual words
+            if phrase_ends and i in phrase_ends:
+                skip_until = phrase_ends[i]
+                phrase = ' '.join(words[i:skip_until])
+                tokens.append(TokenInfo(
+                    value=phrase,
+                    original=phrase,
+                    token_type='phrase',
+                    priority=65,
+                    position_hints=compiled.PHRASE_HINTS,
+                    index=i
+                ))
+                continue
+            
+            # Vocabulary words (product types, brands, descriptors, seasonal
+            # terms, packaging, sides and stopwords) resolve in one lookup
+            entry = vocabulary_get(word.lower())
+            if entry is not None:
+                if entry.token_type is None:
+                    continue
+                
+                if entry.value is not None:
+                    value = entry.value
+                elif entry.uppercase:
+                    value = word.upper()
+                else:
+                    value = word
+                
+                tokens.append(TokenInfo(
+                    value=value,
+                    original=word,
+                    token_type=entry.token_type,
+                    priority=entry.priority,
+                    position_hints=entry.position_hints,
+                    index=i
+                ))
                 continue
             
             # Check for size patterns (number + unit)
-            size_match = re.match(r'^(\d+\.?\d*)\s*([a-zA-Z]+)$', word)
-            if size_match:
-                number, unit = size_match.groups()
-                unit_lower = unit.lower()
+            match = size_match(word)
+            if match:
+                number, unit = match.groups()
                 
-                if unit_lower in self.rules.METRIC_UNITS or unit_lower in self.rules.IMPERIAL_UNITS:
+                if unit.lower() in units:
                     tokens.append(TokenInfo(
                         value=f"{number}{unit}",
                         original=word,
                         token_type='size',
                         priority=90,
-                        position_hints=[Position.PRIMARY_VARIANT, Position.SECONDARY_VARIANT],
+                        position_hints=compiled.SIZE_HINTS,
                         index=i
                     ))
                     continue
@@ -232,106 +484,30 @@ class StrictTokenizer:
                     original=word,
                     token_type='percentage',
                     priority=85,
-                    position_hints=[Position.PRODUCT_NAME],
+                    position_hints=compiled.PERCENTAGE_HINTS,
                     index=i
                 ))
                 continue
             
             # Check for product codes
-            if re.match(r'^[A-Z]\d{2,4}[A-Z]?$', word.upper()):
+            if product_code_match(word.upper()):
                 tokens.append(TokenInfo(
                     value=word.upper(),
                     original=word,
                     token_type='product_code',
                     priority=70,
-                    position_hints=[Position.PRIMARY_VARIANT, Position.SECONDARY_VARIANT],
+                    position_hints=compiled.PRODUCT_CODE_HINTS,
                     index=i
                 ))
                 continue
             
-            # Check for product types (HIGHEST PRIORITY)
-            if word_lower in self.rules.PRODUCT_TYPES:
-                tokens.append(TokenInfo(
-                    value=word,
-                    original=word,
-                    token_type='product_type',
-                    priority=100,  # Highest priority
-                    position_hints=[Position.PRODUCT_TYPE],
-                    index=i
-                ))
-                continue
-            
-            # Check for brand names
-            if word_lower in self.rules.COMMON_BRANDS:
-                tokens.append(TokenInfo(
-                    value=word.upper(),
-                    original=word,
-                    token_type='brand',
-                    priority=80,
-                    position_hints=[Position.PRIMARY_VARIANT],
-                    index=i
-                ))
-                continue
-            
-            # Check for descriptive terms
-            if word_lower in self.rules.DESCRIPTIVE_TERMS:
-                tokens.append(TokenInfo(
-                    value=word,
-                    original=word,
-                    token_type='descriptor',
-                    priority=75,
-                    position_hints=[Position.PRODUCT_NAME, Position.SECONDARY_VARIANT],
-                    index=i
-                ))
-                continue
-            
-            # Check for seasonal terms (lower priority)
-            if word_lower in self.rules.SEASONAL_TERMS:
-                tokens.append(TokenInfo(
-                    value=word,
-                    original=word,
-                    token_type='seasonal',
-                    priority=50,  # Lower priority
-                    position_hints=[Position.SECONDARY_VARIANT, Position.ADDITIONAL_DESCRIPTOR],
-                    index=i
-                ))
-                continue
-            
-            # Check for packaging materials
-            if word_lower in self.rules.PACKAGING_MATERIALS:
-                tokens.append(TokenInfo(
-                    value=word,
-                    original=word,
-                    token_type='packaging',
-                    priority=60,
-                    position_hints=[Position.ADDITIONAL_DESCRIPTOR],
-                    index=i
-                ))
-                continue
-            
-            # Check for side indicators
-            if word_lower in self.rules.SIDE_INDICATORS:
-                tokens.append(TokenInfo(
-                    value=self.rules.SIDE_INDICATORS[word_lower],
-                    original=word,
-                    token_type='side',
-                    priority=70,
-                    position_hints=[Position.PRIMARY_VARIANT],
-                    index=i
-                ))
-                continue
-            
-            # Skip common words
-            if word_lower in ['with', 'and', 'or', 'for', 'of', 'the', 'a', 'an', 'x']:
-                continue
-            
             # Default: unclassified token
             tokens.append(TokenInfo(
                 value=word,
                 original=word,
                 token_type='unclassified',
                 priority=40,
-                position_hints=[Position.PRODUCT_NAME, Position.SECONDARY_VARIANT],
+                position_hints=compiled.UNCLASSIFIED_HINTS,
                 index=i
             ))
         
@@ -340,17 +516,143 @@ class StrictTokenizer:
         
         return tokens
     
+    def _match_phrases(self, words: List[str], phrases: PhraseMatcher,
+                       compiled: 'CompiledRuleset') -> Dict[int, int]:
+        """Map the start index of each leftmost-longest phrase match to its end index"""
+        lowered = [word.lower() for word in words]
+        vocabulary = compiled.vocabulary
+        used_indices = self.used_indices
+        
+        # Position 1 is never abbreviated, so phrases must not absorb product
+        # types; stops[i] is the first blocked index at or after i
+        stops = [len(lowered)] * (len(lowered) + 1)
+        for j in range(len(lowered) - 1, -1, -1):
+            entry = vocabulary.get(lowered[j])
+            blocked = j in used_indices or (entry is not None and entry.token_type == 'product_type')
+            stops[j] = j if blocked else stops[j + 1]
+        
+        matches = {}
+        i = 0
+        while i < len(lowered):
+            end = phrases.longest_match(lowered, i, stops[i])
+            if end > i:
+                matches[i] = end
+                i = end
+            else:
+                i += 1
+        
+        return matches
+    
     def mark_token_used(self, token: TokenInfo):
         """Mark a token as used by its index"""
         token.is_used = True
         self.used_indices.add(token.index)
+    
+    def reset(self):
+        """Forget used indices so the tokenizer can be reused for another text"""
+        self.used_indices.clear()
+        self.candidates = {}
+    
+    def queue_candidates(self, tokens: Iterable[TokenInfo]):
+        """Bucket tokens by type, in text order, so positions can be filled by popping queues"""
+        candidates = {}
+        for token in sorted(tokens, key=lambda token: token.index):
+            queue = candidates.get(token.token_type)
+            if queue is None:
+                queue = candidates[token.token_type] = deque()
+            queue.append(token)
+        self.candidates = candidates
+    
+    def next_candidate(self, token_type: str) -> Optional[TokenInfo]:
+        """Return the earliest unused token of a type, dropping used ones from its queue"""
+        queue = self.candidates.get(token_type)
+        while queue:
+            if not queue[0].is_used:
+                return queue[0]
+            queue.popleft()
+        return None
 
 
 class ShortNameValidator:
     """Validates short names according to the rules"""
     
+    # Words ending in 's' that are not plurals
+    PLURAL_EXCEPTIONS = frozenset({
+        'glass', 'wireless', 'stainless', 'seamless', 'plus', 'lens',
+        'bypass', 'duchess', 'princess', 'countess', 'congress',
+        'gloves', 'scissors', 'forceps'  # Medical exceptions
+    })
+    ABBREVIATION_EXCEPTIONS = frozenset({'OPS', 'IVS', 'ABS', 'EMS', 'NS'})
+    SINGULAR_EXCEPTIONS = frozenset({'diabetes', 'rabies', 'herpes', 'lens'})
+    
     def __init__(self, rules: ShortNameRules):
         self.rules = rules
+        self._allowed_chars = re.compile(rules.ALLOWED_CHARS_PATTERN)
+        self._prohibited_patterns = [(re.compile(pattern), description)
+                                     for pattern, description in rules.PROHIBITED_PATTERNS]
+        self._screen = self._compile_screen(rules)
+    
+    @staticmethod
+    def _compile_screen(rules: ShortNameRules) -> Optional['re.Pattern']:
+        """Combine the character, pattern and plural rules into one pattern.
+        
+        A match is either a rule violation, or the start of a word ending in
+        's' (captured as 'plural', zero-width so it hides no other match).
+        Returns None if the whitelist is not a simple character class.
+        """
+        whitelist = re.fullmatch(r'\^\[(.+)\]\+\$', rules.ALLOWED_CHARS_PATTERN)
+        if whitelist is None:
+            return None
+        
+        violations = [f'[^{whitelist.group(1)}]']
+        violations.extend(f'(?:{pattern})' for pattern, _ in rules.PROHIBITED_PATTERNS)
+        return re.compile('|'.join(violations) + r'|(?<!\S)(?=(?P<plural>\S*[sS])(?!\S))')
+    
+    def validate_all(self, short_name: str, components: List[ShortNameComponent]) -> List[str]:
+        """Run every validation and return the failure messages in rule order.
+        
+        The combined screen checks characters, patterns and plurals in a
+        single pass; the individual checks only run to word the messages
+        when it finds a violation.
+        """
+        errors = []
+        
+        is_valid, message = self.validate_length(short_name)
+        if not is_valid and message:
+            errors.append(message)
+        
+        if not short_name or self._screen_violation(short_name):
+            for check in (self.validate_allowed_characters,
+                          self.validate_prohibited_patterns,
+                          self.validate_singular_form):
+                is_valid, message = check(short_name)
+                if not is_valid and message:
+                    errors.append(message)
+        
+        is_valid, message = self.validate_no_duplicate_meaning(components)
+        if not is_valid and message:
+            errors.append(message)
+        
+        return errors
+    
+    def _screen_violation(self, short_name: str) -> bool:
+        """Check if the combined screen finds any character, pattern or plural violation"""
+        if self._screen is None:
+            return True
+        
+        for match in self._screen.finditer(short_name):
+            word = match.group('plural')
+            if word is None or not self._is_singular(word.lower()):
+                return True
+        return False
+    
+    def _is_singular(self, word: str) -> bool:
+        """Check a lowercased word against the singular form rule"""
+        if word.upper() in self.ABBREVIATION_EXCEPTIONS or word in self.PLURAL_EXCEPTIONS:
+            return True
+        
+        # Check for 's' ending (but not 'ss')
+        return not word.endswith('s') or word.endswith('ss') or word in self.SINGULAR_EXCEPTIONS
     
     def validate_length(self, short_name: str) -> Tuple[bool, Optional[str]]:
         """Validate the total length of the short name"""
@@ -360,7 +662,7 @@ class ShortNameValidator:
     
     def validate_allowed_characters(self, short_name: str) -> Tuple[bool, Optional[str]]:
         """Check if only allowed characters are used"""
-        if not re.match(self.rules.ALLOWED_CHARS_PATTERN, short_name):
+        if not self._allowed_chars.match(short_name):
             prohibited_found = []
             for char in short_name:
                 if char in self.rules.PROHIBITED_CHARS:
@@ -374,28 +676,16 @@ class ShortNameValidator:
     
     def validate_prohibited_patterns(self, short_name: str) -> Tuple[bool, Optional[str]]:
         """Check for prohibited character patterns"""
-        for pattern, description in self.rules.PROHIBITED_PATTERNS:
-            if re.search(pattern, short_name):
+        for pattern, description in self._prohibited_patterns:
+            if pattern.search(short_name):
                 return False, f"Prohibited pattern: {description}"
         return True, None
     
     def validate_singular_form(self, text: str) -> Tuple[bool, Optional[str]]:
         """Check if text uses singular form"""
-        words = text.lower().split()
-        plural_exceptions = {
-            'glass', 'wireless', 'stainless', 'seamless', 'plus', 'lens',
-            'bypass', 'duchess', 'princess', 'countess', 'congress',
-            'gloves', 'scissors', 'forceps'  # Medical exceptions
-        }
-        
-        for word in words:
-            if word.upper() in ['OPS', 'IVS', 'ABS', 'EMS', 'NS'] or word in plural_exceptions:
-                continue
-            
-            # Check for 's' ending (but not 'ss')
-            if word.endswith('s') and not word.endswith('ss'):
-                if word not in ['diabetes', 'rabies', 'herpes', 'lens']:
-                    return False, f"Possible plural form detected: {word}"
+        for word in text.lower().split():
+            if not self._is_singular(word):
+                return False, f"Possible plural form detected: {word}"
         
         return True, None
     
@@ -422,15 +712,47 @@ class ShortNameValidator:
         return True, None
 
 
+# Binary dictionary snapshots: header identifies the format and the
+# marshal version, so any change to either invalidates old snapshots
+SNAPSHOT_DIRNAME = '.dictionary_cache'
+SNAPSHOT_HEADER = b'SNDICT2:' + str(marshal.version).encode() + b'\n'
+
+# Globally unique dictionary versions, so replacing a dictionary object
+# can never reuse the version of the one it replaced
+_dictionary_versions = itertools.count(1)
+
+
 class AbbreviationDictionary:
     """Manages abbreviation dictionary from external sources"""
     
     def __init__(self):
         self.abbreviations: Dict[str, str] = {}
         self.loaded_from: Optional[str] = None
+        self.source_hash: Optional[str] = None  # SHA-256 of the last loaded file
+        self.version: int = next(_dictionary_versions)
+        self.lookups = 0  # get_abbreviation calls, for hit-rate reporting
+        self.hits = 0
+        self._phrases: Optional[PhraseMatcher] = None
+        self._phrases_version: Optional[int] = None
+    
+    def mark_modified(self):
+        """Record a change to the abbreviations so cached results are invalidated"""
+        self.version = next(_dictionary_versions)
+    
+    @property
+    def phrases(self) -> PhraseMatcher:
+        """Phrase matcher over the multi-word entries, rebuilt after each change"""
+        if self._phrases_version != self.version:
+            self._phrases = PhraseMatcher(term for term in self.abbreviations if ' ' in term)
+            self._phrases_version = self.version
+        return self._phrases
     
-    def load_from_file(self, filepath: str) -> bool:
-        """Load abbreviations from Excel or CSV file"""
+    def load_from_file(self, filepath: str, use_snapshot: bool = True) -> bool:
+        """Load abbreviations from Excel or CSV file.
+        
+        The parsed entries are saved as a binary snapshot keyed by the
+        file's content hash, so later loads of the same content skip parsing.
+        """
         try:
             path = Path(filepath)
             
@@ -438,57 +760,570 @@ class AbbreviationDictionary:
                 print(f"Error: File not found: {filepath}")
                 return False
             
-            # Load based on file extension
-            if path.suffix.lower() in ['.xlsx', '.xls']:
-                df = pd.read_excel(filepath, engine='openpyxl')
-            elif path.suffix.lower() == '.csv':
-                df = pd.read_csv(filepath)
-            else:
-                print(f"Error: Unsupported file format: {path.suffix}")
-                return False
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            snapshot_path = self._snapshot_path(path, digest) if use_snapshot else None
             
-            # Assume first column is full form, second is abbreviation
-            if len(df.columns) < 2:
-                print("Error: Dictionary file must have at least 2 columns")
-                return False
+            entries = self._read_snapshot(snapshot_path) if snapshot_path else None
+            if entries is None:
+                entries = self._parse(path, path.suffix)
+                if entries is None:
+                    return False
+                if snapshot_path:
+                    self._write_snapshot(snapshot_path, entries)
             
-            # Build dictionary
-            count = 0
-            for _, row in df.iterrows():
-                full_form = str(row.iloc[0]).strip()
-                abbreviation = str(row.iloc[1]).strip()
-                
-                if full_form and abbreviation and full_form != 'nan':
-                    # Store in lowercase for case-insensitive matching
-                    self.abbreviations[full_form.lower()] = abbreviation.upper()
-                    count += 1
+            self._apply(entries, filepath, digest)
+            return True
             
-            self.loaded_from = filepath
-            print(f"Successfully loaded {count} unique abbreviations from {filepath}")
+        except Exception as e:
+            print(f"Error loading dictionary: {str(e)}")
+            return False
+    
+    def load_from_bytes(self, data: bytes, filename: str) -> bool:
+        """Load abbreviations from the contents of an Excel or CSV file, such as an upload.
+        
+        The format is taken from the filename's extension; nothing is
+        written to disk.
+        """
+        try:
+            entries = self._parse(io.BytesIO(data), Path(filename).suffix)
+            if entries is None:
+                return False
+            
+            self._apply(entries, filename, hashlib.sha256(data).hexdigest())
             return True
             
         except Exception as e:
             print(f"Error loading dictionary: {str(e)}")
             return False
     
+    def _apply(self, entries: Dict[str, str], source: str, digest: str):
+        """Merge parsed entries and record where they came from"""
+        self.mark_modified()
+        self.abbreviations.update(entries)
+        self.loaded_from = source
+        self.source_hash = digest
+        
+        # Build the phrase matcher now rather than on the first request
+        phrase_count = len(self.phrases)
+        print(f"Successfully loaded {len(entries)} unique abbreviations from {source}"
+              + (f" ({phrase_count} multi-word phrases)" if phrase_count else ""))
+    
+    def _parse(self, source: Union[Path, io.BytesIO], suffix: str) -> Optional[Dict[str, str]]:
+        """Parse abbreviations from an Excel or CSV file or in-memory file contents"""
+        # Load based on file extension
+        if suffix.lower() in ['.xlsx', '.xls']:
+            rows = self._read_excel_rows(source)
+        elif suffix.lower() == '.csv':
+            rows = self._read_csv_rows(source)
+        else:
+            print(f"Error: Unsupported file format: {suffix}")
+            return None
+        
+        if rows is None:
+            return None
+        
+        # Build dictionary
+        entries = {}
+        for full_form, abbreviation in rows:
+            full_form = full_form.strip()
+            abbreviation = abbreviation.strip()
+            
+            if full_form and abbreviation and full_form != 'nan':
+                # Store in lowercase with single spaces for case-insensitive
+                # matching of words and phrases
+                entries[' '.join(full_form.lower().split())] = abbreviation.upper()
+        
+        return entries
+    
+    @staticmethod
+    def _read_csv_rows(source: Union[Path, io.BytesIO]) -> Optional[List[Tuple[str, str]]]:
+        """Read (full form, abbreviation) pairs from a CSV file with the stdlib parser"""
+        if isinstance(source, Path):
+            f = open(source, newline='', encoding='utf-8-sig')
+        else:
+            f = io.TextIOWrapper(source, newline='', encoding='utf-8-sig')
+        
+        with f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            
+            # Assume first column is full form, second is abbreviation
+            if len(header) < 2:
+                print("Error: Dictionary file must have at least 2 columns")
+                return None
+            
+            return [(row[0], row[1]) for row in reader if len(row) >= 2]
+    
+    @staticmethod
+    def _read_excel_rows(source: Union[Path, io.BytesIO]) -> Optional[List[Tuple[str, str]]]:
+        """Read (full form, abbreviation) pairs from an Excel file through pandas"""
+        pd = _import_pandas()
+        df = pd.read_excel(source, engine='openpyxl')
+        
+        # Assume first column is full form, second is abbreviation
+        if len(df.columns) < 2:
+            print("Error: Dictionary file must have at least 2 columns")
+            return None
+        
+        # Missing cells become 'nan' and are skipped like empty ones
+        return [
+            (str(full_form), '' if pd.isna(abbreviation) else str(abbreviation))
+            for full_form, abbreviation in zip(df.iloc[:, 0], df.iloc[:, 1])
+        ]
+    
+    @staticmethod
+    def _snapshot_path(source: Path, digest: str) -> Path:
+        """Locate the snapshot for a source file with the given content hash"""
+        directory = os.environ.get('SHORTNAME_SNAPSHOT_DIR') or source.parent / SNAPSHOT_DIRNAME
+        return Path(directory) / f"{source.name}.{digest[:32]}.snapshot"
+    
+    @staticmethod
+    def _read_snapshot(snapshot_path: Path) -> Optional[Dict[str, str]]:
+        """Read a snapshot, returning None if it is missing or unreadable"""
+        try:
+            data = snapshot_path.read_bytes()
+        except OSError:
+            return None
+        
+        if not data.startswith(SNAPSHOT_HEADER):
+            return None
+        
+        try:
+            entries = marshal.loads(data[len(SNAPSHOT_HEADER):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        
+        return entries if isinstance(entries, dict) else None
+    
+    @staticmethod
+    def _write_snapshot(snapshot_path: Path, entries: Dict[str, str]):
+        """Atomically write a snapshot and drop snapshots of older file contents"""
+        try:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(SNAPSHOT_HEADER + marshal.dumps(entries))
+            os.replace(tmp_path, snapshot_path)
+            
+            source_name = snapshot_path.name.rsplit('.', 2)[0]
+            for stale in snapshot_path.parent.glob(f"{glob_escape(source_name)}.*.snapshot"):
+                if stale != snapshot_path:
+                    stale.unlink()
+        except OSError as e:
+            # Snapshots are an optimization; a read-only location is not fatal
+            print(f"Warning: Could not write dictionary snapshot: {e}")
+    
     def get_abbreviation(self, term: str) -> Optional[str]:
         """Get abbreviation for a term"""
-        return self.abbreviations.get(term.lower())
+        abbreviation = self.abbreviations.get(term.lower())
+        self.lookups += 1
+        if abbreviation is not None:
+            self.hits += 1
+        return abbreviation
+
+
+class ShortNameResult(NamedTuple):
+    """Lean processing result without the diagnostic breakdown"""
+    original: str
+    short_name: str
+    success: bool
+    character_count: int
+
+
+# Bump when a change to the processing code alters results, so stored
+# results from older code stop matching
+RESULT_STORE_VERSION = 1
+
+
+def result_fingerprint(rules: ShortNameRules, abbreviations: Dict[str, str]) -> str:
+    """Hash identifying the rules, dictionary and code version a result was produced with"""
+    digest = hashlib.sha256(f"{RESULT_STORE_VERSION}:{rules.fingerprint()}:".encode('utf-8'))
+    digest.update(json.dumps(sorted(abbreviations.items()), ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ResultStore:
+    """Persistent SQLite store of lean results, surviving process restarts.
+    
+    Results are keyed by the SHA-256 of the whitespace-normalized description
+    and the fingerprint of the rules and dictionary that produced them, so a
+    changed dictionary simply stops matching old entries; compact() deletes
+    them. Connections are opened per process (safe across fork) and used
+    under a lock, and the database runs in WAL mode so several worker
+    processes can share one file.
+    """
+    
+    BATCH = 500  # Descriptions per SELECT, below SQLite's bound-parameter limit
+    
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._connection = None
+        self._pid = None
+        self._fingerprint_ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def __enter__(self) -> 'ResultStore':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _connect(self):
+        """Return this process's connection, creating the schema on first use"""
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+        
+        import sqlite3
+        
+        connection = sqlite3.connect(self.filepath, timeout=30, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    id INTEGER PRIMARY KEY,
+                    fingerprint TEXT NOT NULL UNIQUE
+                )""")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    fingerprint_id INTEGER NOT NULL,
+                    description_hash BLOB NOT NULL,
+                    short_name TEXT NOT NULL,
+                    success INTEGER NOT NULL,
+                    character_count INTEGER NOT NULL,
+                    PRIMARY KEY (fingerprint_id, description_hash)
+                ) WITHOUT ROWID""")
+        
+        self._connection = connection
+        self._pid = os.getpid()
+        self._fingerprint_ids = {}
+        return connection
+    
+    def _fingerprint_id(self, connection, fingerprint: str, create: bool) -> Optional[int]:
+        """Map a fingerprint to its row id, registering it when create is set"""
+        fingerprint_id = self._fingerprint_ids.get(fingerprint)
+        if fingerprint_id is None:
+            if create:
+                connection.execute("INSERT OR IGNORE INTO fingerprints (fingerprint) VALUES (?)", (fingerprint,))
+            row = connection.execute("SELECT id FROM fingerprints WHERE fingerprint = ?", (fingerprint,)).fetchone()
+            if row is None:
+                return None
+            fingerprint_id = self._fingerprint_ids[fingerprint] = row[0]
+        return fingerprint_id
+    
+    @staticmethod
+    def _key(description: str) -> bytes:
+        return hashlib.sha256(' '.join(description.split()).encode('utf-8')).digest()
+    
+    def get_many(self, fingerprint: str, descriptions: Iterable[str]) -> Dict[str, ShortNameResult]:
+        """Look up stored results, returning those found keyed by description"""
+        keys: Dict[bytes, List[str]] = {}
+        for description in descriptions:
+            keys.setdefault(self._key(description), []).append(description)
+        
+        found = {}
+        with self._lock:
+            connection = self._connect()
+            fingerprint_id = self._fingerprint_id(connection, fingerprint, create=False)
+            if fingerprint_id is None:
+                return found
+            
+            hashes = list(keys)
+            for start in range(0, len(hashes), self.BATCH):
+                batch = hashes[start:start + self.BATCH]
+                rows = connection.execute(
+                    "SELECT description_hash, short_name, success, character_count FROM results "
+                    f"WHERE fingerprint_id = ? AND description_hash IN ({','.join('?' * len(batch))})",
+                    [fingerprint_id, *batch]
+                )
+                for key, short_name, success, character_count in rows:
+                    for description in keys[key]:
+                        found[description] = ShortNameResult(description, short_name, bool(success), character_count)
+        
+        return found
+    
+    def put_many(self, fingerprint: str, results: Iterable[ShortNameResult]):
+        """Insert or replace results in one transaction"""
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                fingerprint_id = self._fingerprint_id(connection, fingerprint, create=True)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    ((fingerprint_id, self._key(r.original), r.short_name, int(r.success), r.character_count)
+                     for r in results)
+                )
+    
+    def compact(self, keep_fingerprint: str) -> int:
+        """Delete results from every other fingerprint and reclaim the space.
+        
+        Raises ValueError, deleting nothing, when no results are stored under
+        keep_fingerprint: that usually means the wrong rules or dictionary.
+        Returns the number of results deleted.
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                keep_id = self._fingerprint_id(connection, keep_fingerprint, create=False)
+                if keep_id is None:
+                    raise ValueError("No results are stored for the current rules and dictionary; "
+                                     "refusing to delete every stored result")
+                deleted = connection.execute(
+                    "DELETE FROM results WHERE fingerprint_id IS NOT ?", (keep_id,)
+                ).rowcount
+                connection.execute("DELETE FROM fingerprints WHERE id IS NOT ?", (keep_id,))
+            connection.execute("VACUUM")
+            self._fingerprint_ids = {fp: i for fp, i in self._fingerprint_ids.items() if i == keep_id}
+        return deleted
+    
+    def stats(self) -> Dict[str, int]:
+        """Return the number of stored results and fingerprints"""
+        with self._lock:
+            connection = self._connect()
+            results = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            fingerprint_count = connection.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+        return {'results': results, 'fingerprints': fingerprint_count}
+    
+    def close(self):
+        """Close this process's connection"""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+
+class ResultCache:
+    """Thread-safe bounded LRU cache of processing results"""
+    
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key) -> Optional[Dict[str, any]]:
+        """Return the cached result for key, marking it most recently used"""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return result
+    
+    def put(self, key, result: Dict[str, any]):
+        """Store a result, evicting the least recently used entries when full"""
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Drop all entries, keeping the statistics"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, any]:
+        """Return hit/miss/eviction counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class StageProfile(NamedTuple):
+    """Cost of one call to a pipeline stage, passed to the profile hook.
+    
+    Stages are tokenize, build_components, format_value (called once per
+    filled position, nested inside build_components) and build_and_validate.
+    allocated_bytes is only measured when the processor's profile_allocations
+    is set: the peak memory traced by tracemalloc during the call above its
+    level at the start, which includes temporaries freed before the stage
+    returned. tracemalloc is process-wide, so figures taken while other
+    threads allocate are approximate.
+    """
+    stage: str
+    seconds: float
+    allocated_bytes: Optional[int] = None
+
+
+# High-water marks of the traced stages currently running on this thread,
+# so a nested stage resetting the tracemalloc peak does not hide the
+# enclosing stage's peak
+_traced_stages = threading.local()
+
+
+def _profiled_stage(stage: str, func: Callable, hook: Callable[[StageProfile], None],
+                    on_hook_error: Callable[[str, Exception], None]) -> Callable:
+    """Wrap a pipeline stage so its wall time is reported to hook.
+    
+    Exceptions from the hook go to on_hook_error instead of failing the stage.
+    """
+    def profiled(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            try:
+                hook(StageProfile(stage, seconds))
+            except Exception as e:
+                on_hook_error(stage, e)
+    return profiled
+
+
+def _traced_stage(stage: str, func: Callable, hook: Callable[[StageProfile], None],
+                  on_hook_error: Callable[[str, Exception], None]) -> Callable:
+    """Like _profiled_stage, also reporting the peak bytes traced by tracemalloc.
+    
+    Reading and resetting the tracemalloc counters costs the same whatever
+    the heap size; tracing itself slows every allocation while it is on.
+    """
+    import tracemalloc
+    
+    def profiled(*args, **kwargs):
+        peaks = getattr(_traced_stages, 'peaks', None)
+        if peaks is None:
+            peaks = _traced_stages.peaks = []
+        
+        current, peak = tracemalloc.get_traced_memory()
+        if peaks:
+            peaks[-1] = max(peaks[-1], peak)  # Keep the enclosing stage's peak so far
+        tracemalloc.reset_peak()
+        peaks.append(current)
+        
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            stage_peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+            if peaks:
+                peaks[-1] = max(peaks[-1], stage_peak)
+            try:
+                hook(StageProfile(stage, seconds, stage_peak - current))
+            except Exception as e:
+                on_hook_error(stage, e)
+    return profiled
 
 
 class CorrectedShortNameProcessor:
     """Processor with corrected duplicate prevention and dictionary usage"""
     
-    def __init__(self, dictionary_path: Optional[str] = None):
+    def __init__(self, dictionary_path: Optional[str] = None, cache_size: int = 0):
         self.rules = ShortNameRules()
         self.validator = ShortNameValidator(self.rules)
         self.dictionary = AbbreviationDictionary()
         
+        # Optional LRU cache of results, keyed on the dictionary version and
+        # the whitespace-normalized description
+        self.cache = ResultCache(cache_size) if cache_size > 0 else None
+        self._cache_version: Optional[int] = None
+        self._fingerprint: Optional[Tuple[int, str]] = None  # (dictionary version, fingerprint)
+        
+        # Optional profiling callback receiving a StageProfile for each
+        # pipeline stage of every uncached description
+        self.profile_hook: Optional[Callable[['StageProfile'], None]] = None
+        self.profile_hook_errors = 0
+        # Profile only one in this many uncached descriptions
+        self.profile_every = 1
+        self._profile_countdown = 0
+        # Also report each stage's allocated_bytes, starting tracemalloc if needed
+        self.profile_allocations = False
+        
         if dictionary_path:
             self.dictionary.load_from_file(dictionary_path)
     
-    def process_full_description(self, full_description: str) -> Dict[str, any]:
-        """Process a full description with strict duplicate prevention"""
+    def cache_stats(self) -> Optional[Dict[str, any]]:
+        """Return result cache statistics, or None when caching is disabled"""
+        return self.cache.stats() if self.cache is not None else None
+    
+    def fingerprint(self) -> str:
+        """Fingerprint of the current rules and dictionary, for ResultStore keys"""
+        # Hashing a large dictionary is not free, so reuse it until the next change
+        cached = self._fingerprint
+        if cached is not None and cached[0] == self.dictionary.version:
+            return cached[1]
+        
+        fingerprint = result_fingerprint(self.rules, self.dictionary.abbreviations)
+        self._fingerprint = (self.dictionary.version, fingerprint)
+        return fingerprint
+    
+    def process_full_description(self, full_description: str,
+                                 detailed: bool = True) -> Union[Dict[str, any], 'ShortNameResult']:
+        """Process a full description with strict duplicate prevention.
+        
+        With detailed=False a lean ShortNameResult is returned and the token,
+        component and message breakdown is never built.
+        """
+        return self._process(full_description, StrictTokenizer(self.rules), detailed)
+    
+    def process_iter(self, descriptions: Iterable[str],
+                     detailed: bool = True) -> Iterator[Union[Dict[str, any], 'ShortNameResult']]:
+        """Lazily process descriptions, yielding one result per input in order.
+        
+        Accepts any iterable (a file, a generator, a database cursor) and
+        reuses one tokenizer for the whole batch, so only the current
+        description and its result are held in memory.
+        """
+        tokenizer = StrictTokenizer(self.rules)
+        process = self._process
+        
+        for description in descriptions:
+            tokenizer.reset()
+            yield process(description, tokenizer, detailed)
+    
+    def _process(self, full_description: str, tokenizer: StrictTokenizer,
+                 detailed: bool = True) -> Union[Dict[str, any], 'ShortNameResult']:
+        """Process a description, consulting the result cache when enabled.
+        
+        Cached detailed results are shallow copies sharing their nested
+        lists, which callers must treat as read-only.
+        """
+        run = self._run_pipeline if detailed else self._run_lean_pipeline
+        
+        cache = self.cache
+        if cache is None or not isinstance(full_description, str):
+            return run(full_description, tokenizer)
+        
+        # Entries from an older dictionary can never hit again, so free them
+        version = self.dictionary.version
+        if version != self._cache_version:
+            cache.clear()
+            self._cache_version = version
+        
+        key = (version, detailed, ' '.join(full_description.split()))
+        result = cache.get(key)
+        if result is None:
+            result = run(full_description, tokenizer)
+            cache.put(key, result)
+        
+        # Results differ only in the original text for equal keys
+        if detailed:
+            result = dict(result)
+            result['original'] = full_description
+        elif result.original != full_description:
+            result = result._replace(original=full_description)
+        return result
+    
+    def _run_pipeline(self, full_description: str, tokenizer: StrictTokenizer) -> Dict[str, any]:
+        """Run the tokenize/build/validate pipeline with a clean tokenizer"""
         result = {
             'original': full_description,
             'short_name': '',
@@ -499,19 +1334,18 @@ class CorrectedShortNameProcessor:
             'character_count': 0
         }
         
+        tokenize, build, validate = self._stages(tokenizer)
+        
         try:
-            # Create new tokenizer for each processing
-            tokenizer = StrictTokenizer(self.rules)
-            
             # Step 1: Tokenize
-            tokens = tokenizer.tokenize(full_description)
+            tokens = tokenize(full_description, self.dictionary.phrases)
             result['tokens'] = [self._token_to_dict(t) for t in tokens]
             
             # Step 2: Build components with strict no-duplicate logic
-            components = self._build_components_strict(tokens, tokenizer)
+            components = build(tokens, tokenizer)
             
             # Step 3: Build and validate short name
-            short_name, messages = self._build_and_validate(components)
+            short_name, messages = validate(components)
             
             result['short_name'] = short_name
             result['components'] = [self._component_to_dict(c) for c in components]
@@ -525,30 +1359,94 @@ class CorrectedShortNameProcessor:
         
         return result
     
-    def _build_components_strict(self, tokens: List[TokenInfo], tokenizer: StrictTokenizer) -> List[ShortNameComponent]:
-        """Build components with strict duplicate prevention"""
+    def _run_lean_pipeline(self, full_description: str, tokenizer: StrictTokenizer) -> 'ShortNameResult':
+        """Run the pipeline keeping only the short name and its validity"""
+        tokenize, build, validate = self._stages(tokenizer)
+        
+        try:
+            tokens = tokenize(full_description, self.dictionary.phrases)
+            components = build(tokens, tokenizer)
+            short_name, messages = validate(components, report_success=False)
+        except Exception:
+            return ShortNameResult(full_description, '', False, 0)
+        
+        success = all('Error' not in msg for msg in messages)
+        return ShortNameResult(full_description, short_name, success, len(short_name))
+    
+    def _stages(self, tokenizer: StrictTokenizer) -> Tuple[Callable, Callable, Callable]:
+        """Return the tokenize, build and validate callables, profiled when a hook is set"""
+        hook = self.profile_hook
+        if hook is not None and self.profile_every > 1:
+            # Sampling needs no lock: a race only shifts which description is profiled
+            self._profile_countdown -= 1
+            if self._profile_countdown > 0:
+                hook = None
+            else:
+                self._profile_countdown = self.profile_every
+        if hook is None:
+            return tokenizer.tokenize, self._build_components_strict, self._build_and_validate
+        
+        wrap = _profiled_stage
+        if self.profile_allocations:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            wrap = _traced_stage
+        
+        failed = self._profile_hook_failed
+        format_value = wrap('format_value', self._format_token_value, hook, failed)
+        build_components = wrap('build_components', self._build_components_strict, hook, failed)
+        
+        def build(tokens: List[TokenInfo], tokenizer: StrictTokenizer) -> List[ShortNameComponent]:
+            return build_components(tokens, tokenizer, format_value)
+        
+        return (wrap('tokenize', tokenizer.tokenize, hook, failed),
+                build,
+                wrap('build_and_validate', self._build_and_validate, hook, failed))
+    
+    def _profile_hook_failed(self, stage: str, error: Exception):
+        """Count a failed profile hook call; results are unaffected and only the first is printed"""
+        self.profile_hook_errors += 1
+        if self.profile_hook_errors == 1:
+            print(f"Warning: profile_hook failed for stage {stage}: {error}")
+    
+    def _build_components_strict(self, tokens: List[TokenInfo], tokenizer: StrictTokenizer,
+                                 format_value: Optional[Callable[[TokenInfo, Position], str]] = None) -> List[ShortNameComponent]:
+        """Build components from tokens with strict duplicate prevention.
+        
+        tokenizer supplies the used-index bookkeeping; its candidate queues
+        are rebuilt here from tokens.
+        """
+        if format_value is None:
+            format_value = self._format_token_value
+        
         components = []
         filled_positions = set()
         
+        # Each token type has a queue of unused tokens in text order; all
+        # tokens of a type share priority and position hints, so the queue
+        # front is always the token the priority-sorted scan would pick
+        tokenizer.queue_candidates(tokens)
+        next_candidate = tokenizer.next_candidate
+        
         # CRITICAL: First find and lock the product type
         product_type_component = None
-        for token in tokens:
-            if token.token_type == 'product_type' and not token.is_used:
-                # Position 1 MUST NOT be abbreviated - use full spelling
-                value = token.value.capitalize()  # Capitalize, not uppercase
-                
-                product_type_component = ShortNameComponent(
-                    position=Position.PRODUCT_TYPE,
-                    value=value,  # Full spelling, no abbreviation
-                    original_value=token.original,
-                    is_mandatory=True,
-                    applied_rules=['product_type', 'no_abbreviation', 'full_spelling'],
-                    token_index=token.index
-                )
-                
-                # Mark this token as used immediately
-                tokenizer.mark_token_used(token)
-                break
+        token = next_candidate('product_type')
+        if token is not None:
+            # Position 1 MUST NOT be abbreviated - use full spelling
+            value = token.value.capitalize()  # Capitalize, not uppercase
+            
+            product_type_component = ShortNameComponent(
+                position=Position.PRODUCT_TYPE,
+                value=value,  # Full spelling, no abbreviation
+                original_value=token.original,
+                is_mandatory=True,
+                applied_rules=rule_names('product_type', 'no_abbreviation', 'full_spelling'),
+                token_index=token.index
+            )
+            
+            # Mark this token as used immediately
+            tokenizer.mark_token_used(token)
         
         # If we found a product type, add it first
         if product_type_component:
@@ -556,8 +1454,8 @@ class CorrectedShortNameProcessor:
             filled_positions.add(Position.PRODUCT_TYPE)
         else:
             # Try to infer product type from the last noun-like word
-            for token in reversed(tokens):
-                if not token.is_used and token.token_type in ['unclassified']:
+            for token in reversed(tokenizer.candidates.get('unclassified', ())):
+                if not token.is_used:
                     # Check if it could be a product type
                     if any(token.value.lower().endswith(suffix) for suffix in ['bar', 'piece', 'unit']):
                         value = token.value.capitalize()
@@ -567,7 +1465,7 @@ class CorrectedShortNameProcessor:
                             value=value,
                             original_value=token.original,
                             is_mandatory=True,
-                            applied_rules=['inferred_type', 'no_abbreviation'],
+                            applied_rules=rule_names('inferred_type', 'no_abbreviation'),
                             token_index=token.index
                         )
                         
@@ -579,8 +1477,8 @@ class CorrectedShortNameProcessor:
         # Now fill other positions
         position_rules = [
             (Position.PRIMARY_VARIANT, ['size', 'brand', 'side', 'product_code']),
-            (Position.PRODUCT_NAME, ['percentage', 'descriptor']),
-            (Position.SECONDARY_VARIANT, ['descriptor', 'seasonal', 'unclassified']),
+            (Position.PRODUCT_NAME, ['percentage', 'descriptor', 'phrase']),
+            (Position.SECONDARY_VARIANT, ['descriptor', 'seasonal', 'phrase', 'unclassified']),
             (Position.ADDITIONAL_DESCRIPTOR, ['packaging', 'seasonal'])
         ]
         
@@ -590,46 +1488,39 @@ class CorrectedShortNameProcessor:
             
             # Try each preferred type
             for pref_type in preferred_types:
-                component_added = False
+                token = next_candidate(pref_type)
+                if token is None or position not in token.position_hints:
+                    continue
                 
-                for token in tokens:
-                    if (token.token_type == pref_type and 
-                        not token.is_used and 
-                        position in token.position_hints):
-                        
-                        # Format the value
-                        value = self._format_token_value(token, position)
-                        
-                        # Apply dictionary abbreviation if:
-                        # 1. Not Position 1 (Product Type)
-                        # 2. Dictionary has an abbreviation
-                        if position != Position.PRODUCT_TYPE:
-                            abbrev = self.dictionary.get_abbreviation(token.original)
-                            if abbrev:
-                                value = abbrev
-                                applied_rules = [token.token_type, 'dictionary_abbrev']
-                            else:
-                                applied_rules = [token.token_type, 'no_abbrev_found']
-                        else:
-                            applied_rules = [token.token_type, 'no_abbreviation']
-                        
-                        component = ShortNameComponent(
-                            position=position,
-                            value=value,
-                            original_value=token.original,
-                            is_mandatory=False,
-                            applied_rules=applied_rules,
-                            token_index=token.index
-                        )
-                        
-                        components.append(component)
-                        filled_positions.add(position)
-                        tokenizer.mark_token_used(token)
-                        component_added = True
-                        break
+                # Format the value
+                value = format_value(token, position)
                 
-                if component_added:
-                    break
+                # Apply dictionary abbreviation if:
+                # 1. Not Position 1 (Product Type)
+                # 2. Dictionary has an abbreviation
+                if position != Position.PRODUCT_TYPE:
+                    abbrev = self.dictionary.get_abbreviation(token.original)
+                    if abbrev:
+                        value = abbrev
+                        applied_rules = rule_names(token.token_type, 'dictionary_abbrev')
+                    else:
+                        applied_rules = rule_names(token.token_type, 'no_abbrev_found')
+                else:
+                    applied_rules = rule_names(token.token_type, 'no_abbreviation')
+                
+                component = ShortNameComponent(
+                    position=position,
+                    value=value,
+                    original_value=token.original,
+                    is_mandatory=False,
+                    applied_rules=applied_rules,
+                    token_index=token.index
+                )
+                
+                components.append(component)
+                filled_positions.add(position)
+                tokenizer.mark_token_used(token)
+                break
         
         # Sort by position
         components.sort(key=lambda x: x.position.value)
@@ -642,7 +1533,7 @@ class CorrectedShortNameProcessor:
         
         if token.token_type == 'size':
             # Format size with units
-            match = re.match(r'^(\d+\.?\d*)\s*([a-zA-Z]+)$', value)
+            match = CompiledRuleset.SIZE_PATTERN.match(value)
             if match:
                 number, unit = match.groups()
                 unit_lower = unit.lower()
@@ -681,7 +1572,8 @@ class CorrectedShortNameProcessor:
         
         return value
     
-    def _build_and_validate(self, components: List[ShortNameComponent]) -> Tuple[str, List[str]]:
+    def _build_and_validate(self, components: List[ShortNameComponent],
+                            report_success: bool = True) -> Tuple[str, List[str]]:
         """Build and validate the short name"""
         messages = []
         
@@ -699,19 +1591,10 @@ class CorrectedShortNameProcessor:
         short_name = re.sub(r'\s+', ' ', short_name.strip())
         
         # Validate
-        validations = [
-            self.validator.validate_length(short_name),
-            self.validator.validate_allowed_characters(short_name),
-            self.validator.validate_prohibited_patterns(short_name),
-            self.validator.validate_singular_form(short_name),
-            self.validator.validate_no_duplicate_meaning(components)
-        ]
-        
-        for is_valid, message in validations:
-            if not is_valid and message:
-                messages.append(f"Validation Error: {message}")
+        for message in self.validator.validate_all(short_name, components):
+            messages.append(f"Validation Error: {message}")
         
-        if not any('Error' in msg for msg in messages):
+        if report_success and not any('Error' in msg for msg in messages):
             messages.append(f"Success: Generated short name with {len(short_name)} characters")
         
         return short_name, messages
@@ -736,11 +1619,199 @@ class CorrectedShortNameProcessor:
             'value': component.value,
             'original': component.original_value,
             'mandatory': component.is_mandatory,
-            'rules_applied': component.applied_rules,
+            'rules_applied': list(component.applied_rules),
             'token_index': component.token_index
         }
 
 
+# Parallel batch processing
+
+# Processor owned by a pool worker, built once by _init_worker
+_worker_processor: Optional[CorrectedShortNameProcessor] = None
+
+
+def _init_worker(dictionary_path: Optional[str], dictionary: Optional[AbbreviationDictionary],
+                 cache_size: int):
+    """Build the worker's processor once when the pool process starts.
+    
+    A dictionary loaded by the parent is used as is (inherited on fork,
+    pickled otherwise); only without one is dictionary_path read here. A
+    load failure raises, which breaks the pool (BrokenProcessPool) instead
+    of leaving a worker that silently runs without abbreviations.
+    """
+    global _worker_processor
+    if dictionary is None:
+        dictionary = _load_dictionary(dictionary_path)
+    
+    processor = CorrectedShortNameProcessor(cache_size=cache_size)
+    processor.dictionary = dictionary
+    # Keep the inherited objects out of this process's collections, so the
+    # GC does not write to (and copy) the pages shared with the parent
+    gc.freeze()
+    _worker_processor = processor
+
+
+CACHE_COUNTERS = ('hits', 'misses', 'evictions')
+
+
+def _process_chunk(descriptions: List[str], detailed: bool, profile: Optional[Tuple[int, bool]]
+                   ) -> Tuple[List[Union[Dict[str, any], ShortNameResult]], List[StageProfile], Optional[Dict[str, int]]]:
+    """Process one chunk of descriptions inside a pool worker.
+    
+    profile is None or the parent's (profile_every, profile_allocations).
+    Returns the results, the chunk's StageProfiles when profiling, and how
+    much the worker's result cache counters grew (None without a cache).
+    """
+    processor = _worker_processor
+    profiles = []
+    before = processor.cache_stats()
+    
+    processor.profile_hook = profiles.append if profile else None
+    if profile:
+        processor.profile_every, processor.profile_allocations = profile
+    try:
+        results = list(processor.process_iter(descriptions, detailed))
+    finally:
+        processor.profile_hook = None
+    
+    after = processor.cache_stats()
+    cache = {key: after[key] - before[key] for key in CACHE_COUNTERS} if after is not None else None
+    return results, profiles, cache
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most `size` items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ParallelBatchProcessor:
+    """Processes descriptions across a process pool, one processor per worker.
+    
+    Workers build their processor once in the pool initializer, so tasks
+    only carry description strings. Pass the already loaded dictionary to
+    share it with the workers instead of having each re-read
+    dictionary_path; on platforms that fork, its pages are then shared
+    copy-on-write rather than parsed once per worker. Results come back in input order,
+    and at most `max_pending` chunks are in flight, so arbitrarily long
+    inputs can be streamed through `process_iter`.
+    
+    As on CorrectedShortNameProcessor, an optional profile_hook receives a
+    StageProfile per pipeline stage (subject to profile_every and
+    profile_allocations); workers record them and this process replays
+    them as each chunk completes. cache_stats() sums the workers'
+    result cache counters the same way.
+    """
+    
+    def __init__(self, dictionary_path: Optional[str] = None, workers: Optional[int] = None,
+                 chunk_size: int = 500, max_pending: Optional[int] = None, cache_size: int = 0,
+                 dictionary: Optional[AbbreviationDictionary] = None):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        self.dictionary = dictionary
+        self.dictionary_path = dictionary.loaded_from if dictionary is not None else dictionary_path
+        self.cache_size = cache_size
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or self.workers * 2
+        self._executor = None  # ProcessPoolExecutor, created by start()
+        
+        self.profile_hook: Optional[Callable[[StageProfile], None]] = None
+        self.profile_hook_errors = 0
+        self.profile_every = 1
+        self.profile_allocations = False
+        self._cache_counts = dict.fromkeys(CACHE_COUNTERS, 0)
+        self._stats_lock = threading.Lock()
+    
+    def __enter__(self) -> 'ParallelBatchProcessor':
+        self.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def start(self):
+        """Start the worker pool if it is not running yet and return it"""
+        executor = self._executor
+        if executor is None:
+            # Imported here to keep multiprocessing out of the module import
+            from concurrent.futures import ProcessPoolExecutor
+            
+            executor = self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.dictionary_path, self.dictionary, self.cache_size)
+            )
+        return executor
+    
+    def close(self):
+        """Shut down the worker pool, waiting for running chunks"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def process_iter(self, descriptions: Iterable[str],
+                     detailed: bool = True) -> Iterator[Union[Dict[str, any], ShortNameResult]]:
+        """Lazily process descriptions in parallel, yielding results in input order"""
+        # A concurrent close() resets self._executor; keep submitting to this
+        # pool, which then raises RuntimeError instead of an AttributeError
+        executor = self.start()
+        pending = deque()
+        
+        profile = (self.profile_every, self.profile_allocations) if self.profile_hook is not None else None
+        
+        for chunk in _chunked(descriptions, self.chunk_size):
+            pending.append(executor.submit(_process_chunk, chunk, detailed, profile))
+            
+            # Keep a bounded window of chunks in flight
+            if len(pending) >= self.max_pending:
+                yield from self._chunk_results(pending.popleft())
+        
+        while pending:
+            yield from self._chunk_results(pending.popleft())
+    
+    def _chunk_results(self, future) -> List[Union[Dict[str, any], ShortNameResult]]:
+        """Wait for a chunk, record its profiles and cache counters and return its results"""
+        results, profiles, cache = future.result()
+        
+        hook = self.profile_hook
+        if hook is not None:
+            for profile in profiles:
+                try:
+                    hook(profile)
+                except Exception as e:
+                    self.profile_hook_errors += 1
+                    if self.profile_hook_errors == 1:
+                        print(f"Warning: profile_hook failed for stage {profile.stage}: {e}")
+        
+        if cache is not None:
+            with self._stats_lock:
+                for key, count in cache.items():
+                    self._cache_counts[key] += count
+        return results
+    
+    def cache_stats(self) -> Optional[Dict[str, any]]:
+        """Return the workers' combined result cache counters, or None when caching is disabled"""
+        if self.cache_size <= 0:
+            return None
+        
+        with self._stats_lock:
+            stats = dict(self._cache_counts)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+    
+    def process_batch(self, descriptions: Iterable[str],
+                      detailed: bool = True) -> List[Union[Dict[str, any], ShortNameResult]]:
+        """Process descriptions in parallel and return all results in input order"""
+        return list(self.process_iter(descriptions, detailed))
+
+
 # Convenience functions
 
 def print_result(result: Dict[str, any], detailed: bool = True):
@@ -772,3 +1843,547 @@ def print_result(result: Dict[str, any], detailed: bool = True):
                 print(f"   ✅ {msg}")
     
     print(f"{'='*60}\n")
+
+
+# Catalog conversion
+
+OUTPUT_COLUMNS = ['short_name', 'success', 'character_count']
+EXCEL_SUFFIXES = ('.xlsx', '.xlsm')
+
+
+def iter_catalog_rows(filepath: str, sheet: Optional[str] = None) -> Iterator[List]:
+    """Stream rows (header first) from a CSV or Excel catalog without loading it whole"""
+    path = Path(filepath)
+    
+    if path.suffix.lower() in EXCEL_SUFFIXES:
+        from openpyxl import load_workbook
+        
+        workbook = load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if sheet else workbook.active
+            for row in worksheet.iter_rows(values_only=True):
+                yield ['' if value is None else value for value in row]
+        finally:
+            workbook.close()
+    elif path.suffix.lower() == '.csv':
+        with open(filepath, newline='', encoding='utf-8-sig') as f:
+            yield from csv.reader(f)
+    else:
+        raise ValueError(f"Unsupported file format: {path.suffix}")
+
+
+class CatalogWriter:
+    """Appends rows to a CSV or write-only Excel file as they are produced"""
+    
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self._file = None
+        self._workbook = None
+        
+        suffix = Path(filepath).suffix.lower()
+        if suffix in EXCEL_SUFFIXES:
+            from openpyxl import Workbook
+            
+            self._workbook = Workbook(write_only=True)
+            self._sheet = self._workbook.create_sheet()
+            self._append = self._sheet.append
+        elif suffix == '.csv':
+            self._file = open(filepath, 'w', newline='', encoding='utf-8')
+            self._append = csv.writer(self._file).writerow
+        else:
+            raise ValueError(f"Unsupported file format: {suffix}")
+    
+    def __enter__(self) -> 'CatalogWriter':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def write_row(self, row: List):
+        """Append a single row"""
+        self._append(row)
+    
+    def flush(self):
+        """Push buffered CSV output to disk (Excel is only written on close)"""
+        if self._file is not None:
+            self._file.flush()
+    
+    def close(self):
+        """Finish the output file"""
+        if self._workbook is not None:
+            self._workbook.save(self.filepath)
+            self._workbook = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _resolve_column(header: List, column: Optional[str]) -> int:
+    """Find the description column by name or 1-based number"""
+    if column is None:
+        return 0
+    
+    names = [str(name).strip() for name in header]
+    if column in names:
+        return names.index(column)
+    if column.isdigit() and 1 <= int(column) <= len(header):
+        return int(column) - 1
+    
+    raise ValueError(f"Column not found: {column} (available: {', '.join(names)})")
+
+
+def catalog_output_row(row: List, width: int, result: ShortNameResult) -> List:
+    """Catalog row padded to the header width, followed by the OUTPUT_COLUMNS values.
+    
+    CSV rows can be shorter than the header (or empty); without padding the
+    results would land under the wrong headers.
+    """
+    padding = [''] * (width - len(row))
+    return list(row) + padding + [result.short_name, result.success, result.character_count]
+
+
+def _cell(row: List, col: int) -> str:
+    """Description text of a catalog row"""
+    return str(row[col]) if col < len(row) else ''
+
+
+def _load_dictionary(dictionary_path: Optional[str]) -> AbbreviationDictionary:
+    """Load the dictionary for a catalog run, raising ValueError when it cannot be loaded"""
+    dictionary = AbbreviationDictionary()
+    if dictionary_path and not dictionary.load_from_file(dictionary_path):
+        raise ValueError(f"Could not load dictionary: {dictionary_path}")
+    return dictionary
+
+
+def _open_engine(dictionary_path: Optional[str], workers: int, chunk_size: int, cache_size: int
+                 ) -> Tuple[Union[CorrectedShortNameProcessor, 'ParallelBatchProcessor'], AbbreviationDictionary]:
+    """Create the serial processor or the process pool for a catalog run.
+    
+    The dictionary is loaded once in this process and handed to the pool
+    workers, so a path that does not load fails the run up front instead
+    of producing a catalog without abbreviations.
+    """
+    dictionary = _load_dictionary(dictionary_path)
+    if workers > 1:
+        return ParallelBatchProcessor(workers=workers, chunk_size=chunk_size, cache_size=cache_size,
+                                      dictionary=dictionary), dictionary
+    
+    processor = CorrectedShortNameProcessor(cache_size=cache_size)
+    processor.dictionary = dictionary
+    return processor, dictionary
+
+
+def _catalog_results(engine, descriptions: Iterable[str], store: Optional[ResultStore] = None,
+                     fingerprint: Optional[str] = None, batch_size: int = 1000) -> Iterator[ShortNameResult]:
+    """Lean results in input order, reusing and filling the result store when given"""
+    if store is None:
+        return engine.process_iter(descriptions, detailed=False)
+    return _stored_results(engine, descriptions, store, fingerprint, batch_size)
+
+
+def _stored_results(engine, descriptions: Iterable[str], store: ResultStore, fingerprint: str,
+                    batch_size: int) -> Iterator[ShortNameResult]:
+    """Look up each batch in the store and process only the descriptions it lacks"""
+    for batch in _chunked(descriptions, batch_size):
+        found = store.get_many(fingerprint, batch)
+        missing = [description for description in dict.fromkeys(batch) if description not in found]
+        if missing:
+            computed = list(engine.process_iter(missing, detailed=False))
+            store.put_many(fingerprint, computed)
+            found.update(zip(missing, computed))
+        
+        for description in batch:
+            yield found[description]
+
+
+def compact_store(store_path: str, dictionary_path: Optional[str] = None) -> int:
+    """Drop stored results that do not match the current rules and dictionary"""
+    fingerprint = result_fingerprint(ShortNameRules(), _load_dictionary(dictionary_path).abbreviations)
+    with ResultStore(store_path) as store:
+        return store.compact(fingerprint)
+
+
+def _report_progress(count: int, started: float, done: bool = False, note: str = ''):
+    """Print a row count and rate to stderr, overwriting the previous update"""
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed > 0 else 0.0
+    if done:
+        print(f"\r{count:,} rows in {elapsed:.1f}s  {rate:,.0f} rows/s{note}", file=sys.stderr)
+    else:
+        print(f"\r{count:,} rows  {rate:,.0f} rows/s", end='', file=sys.stderr, flush=True)
+
+
+def convert_catalog(input_path: str, output_path: str, dictionary_path: Optional[str] = None,
+                    column: Optional[str] = None, sheet: Optional[str] = None,
+                    chunk_size: int = 1000, workers: int = 1, cache_size: int = 0,
+                    progress: bool = True, index_path: Optional[str] = None,
+                    store_path: Optional[str] = None) -> int:
+    """Generate short names for every catalog row, streaming input to output.
+    
+    With index_path, a CatalogIndex of the run is saved there so later
+    dictionary edits can be applied with update_catalog. With store_path,
+    results already in that ResultStore are reused and new ones added.
+    Returns the number of data rows written.
+    """
+    # The output is written while the input is still being read
+    if Path(output_path).resolve() == Path(input_path).resolve():
+        raise ValueError("Output must be a different file from the input")
+    
+    rows = iter_catalog_rows(input_path, sheet)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError(f"Catalog is empty: {input_path}")
+    
+    col = _resolve_column(header, column)
+    engine, dictionary = _open_engine(dictionary_path, workers, chunk_size, cache_size)
+    index = CatalogIndex(ShortNameRules()) if index_path else None
+    
+    store = ResultStore(store_path) if store_path else None
+    
+    # The engine reads ahead by at most its in-flight window, which tee buffers
+    rows, pending_rows = tee(rows)
+    descriptions = (_cell(row, col) for row in rows)
+    
+    count = 0
+    started = time.perf_counter()
+    
+    try:
+        fingerprint = result_fingerprint(ShortNameRules(), dictionary.abbreviations) if store else None
+        results = _catalog_results(engine, descriptions, store, fingerprint, chunk_size * max(1, workers))
+        
+        with CatalogWriter(output_path) as writer:
+            writer.write_row(list(header) + OUTPUT_COLUMNS)
+            
+            for row, result in zip(pending_rows, results):
+                writer.write_row(catalog_output_row(row, len(header), result))
+                if index is not None:
+                    index.add(count, _cell(row, col))
+                count += 1
+                
+                if count % chunk_size == 0:
+                    writer.flush()
+                    if progress:
+                        _report_progress(count, started)
+        
+        if index is not None:
+            index.save(index_path, input_path, col, sheet, dictionary.abbreviations)
+    finally:
+        if isinstance(engine, ParallelBatchProcessor):
+            engine.close()
+        if store is not None:
+            store.close()
+    
+    if progress:
+        _report_progress(count, started, done=True)
+    
+    return count
+
+
+# Incremental regeneration
+
+# Index files are marshal data behind a header naming the format and the
+# marshal version, like dictionary snapshots
+INDEX_HEADER = b'SNINDEX2:' + str(marshal.version).encode() + b'\n'
+
+
+def _file_sha256(path: str) -> str:
+    """SHA-256 of a file, read in blocks so large catalogs stay out of memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def changed_terms(old: Dict[str, str], new: Dict[str, str]) -> Set[str]:
+    """Dictionary keys that were added, removed or given a different abbreviation"""
+    changed = {term for term, abbreviation in new.items() if old.get(term) != abbreviation}
+    changed.update(term for term in old if term not in new)
+    return changed
+
+
+def _decode_postings(data: bytes) -> List[int]:
+    """Row numbers of a posting list stored as varint-encoded gaps"""
+    rows = []
+    row = -1
+    gap = shift = 0
+    for byte in data:
+        gap |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            row += gap
+            rows.append(row)
+            gap = shift = 0
+    return rows
+
+
+class CatalogIndex:
+    """Reverse index from lowercased description words to catalog row numbers.
+    
+    A dictionary entry can only change the short name of a row that contains
+    every word of the entry: single words through the abbreviation lookup,
+    multi-word entries through phrase matching. Words the tokenizer always
+    skips (stopwords) are not indexed, since they never produce a token.
+    
+    Each posting list is a bytearray of varint-encoded gaps between row
+    numbers, mostly one byte per row, so large catalogs do not turn into
+    millions of boxed ints.
+    """
+    
+    def __init__(self, rules: ShortNameRules):
+        vocabulary = rules.compiled().vocabulary
+        self.skipped = frozenset(word for word, entry in vocabulary.items() if entry.token_type is None)
+        self.postings: Dict[str, Union[bytearray, bytes]] = {}  # bytes once loaded
+        self._last_rows: Dict[str, int] = {}  # Last row added per word, for the next gap
+        self.rows = 0
+        self.dictionary: Dict[str, str] = {}
+        self.metadata: Dict[str, any] = {}
+    
+    def add(self, row: int, description: str):
+        """Index the words of one row; rows must be added in increasing order"""
+        skipped = self.skipped
+        postings = self.postings
+        last_rows = self._last_rows
+        for word in set(description.lower().split()):
+            if word not in skipped:
+                data = postings.get(word)
+                if data is None:
+                    data = postings[word] = bytearray()
+                gap = row - last_rows.get(word, -1)
+                last_rows[word] = row
+                while gap > 0x7F:
+                    data.append(gap & 0x7F | 0x80)
+                    gap >>= 7
+                data.append(gap)
+        self.rows = row + 1
+    
+    def affected_rows(self, terms: Iterable[str]) -> Optional[Set[int]]:
+        """Rows whose short name may change when these dictionary terms change.
+        
+        Returns None when every row may be affected (a term made of skipped
+        words only, which could still start matching as a phrase).
+        """
+        affected = set()
+        for term in terms:
+            words = [word for word in term.split() if word not in self.skipped]
+            if not words:
+                if ' ' in term:
+                    return None
+                continue  # A skipped single word is never looked up
+            
+            # Intersect posting lists from the rarest word up
+            lists = sorted((self.postings.get(word, b'') for word in words), key=len)
+            rows = set(_decode_postings(lists[0]))
+            for other in lists[1:]:
+                if not rows:
+                    break
+                rows.intersection_update(_decode_postings(other))
+            affected |= rows
+        return affected
+    
+    def save(self, filepath: str, catalog_path: str, column: int, sheet: Optional[str],
+             dictionary: Dict[str, str]):
+        """Write the index with the run's catalog hash and dictionary contents"""
+        data = {
+            'catalog_sha256': _file_sha256(catalog_path),
+            'column': column,
+            'sheet': sheet,
+            'rows': self.rows,
+            'dictionary': dictionary,
+            'postings': {word: bytes(rows) for word, rows in self.postings.items()}
+        }
+        
+        # Replace atomically so an interrupted run leaves the old index usable
+        tmp_path = Path(f"{filepath}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(INDEX_HEADER)
+            marshal.dump(data, f)
+        os.replace(tmp_path, filepath)
+    
+    @classmethod
+    def load(cls, filepath: str, rules: ShortNameRules) -> 'CatalogIndex':
+        """Read an index written by save"""
+        with open(filepath, 'rb') as f:
+            if f.read(len(INDEX_HEADER)) != INDEX_HEADER:
+                raise ValueError(f"Unsupported catalog index (run a full conversion to rebuild it): {filepath}")
+            try:
+                data = marshal.load(f)
+            except (EOFError, ValueError, TypeError):
+                data = None
+        if not isinstance(data, dict):
+            raise ValueError(f"Corrupt catalog index: {filepath}")
+        
+        index = cls(rules)
+        index.postings = data['postings']
+        index.rows = data['rows']
+        index.dictionary = data['dictionary']
+        index.metadata = {key: data[key] for key in ('catalog_sha256', 'column', 'sheet')}
+        return index
+
+
+def update_catalog(input_path: str, output_path: str, previous_output: str, index_path: str,
+                   dictionary_path: Optional[str] = None, chunk_size: int = 1000, workers: int = 1,
+                   cache_size: int = 0, progress: bool = True,
+                   store_path: Optional[str] = None) -> Tuple[int, int]:
+    """Re-generate only the rows a dictionary change can affect.
+    
+    Compares the dictionary recorded in the index with the new one, looks up
+    the rows containing the changed terms, reprocesses those and copies every
+    other row from the previous output. The catalog must be unchanged since
+    the index was written; rule changes still need a full convert_catalog.
+    Returns (rows written, rows regenerated) and refreshes the index.
+    """
+    if Path(output_path).resolve() == Path(previous_output).resolve():
+        raise ValueError("Output must be a different file from the previous output")
+    if Path(output_path).resolve() == Path(input_path).resolve():
+        raise ValueError("Output must be a different file from the input")
+    
+    engine, dictionary = _open_engine(dictionary_path, workers, chunk_size, cache_size)
+    store = ResultStore(store_path) if store_path else None
+    try:
+        index = CatalogIndex.load(index_path, ShortNameRules())
+        if _file_sha256(input_path) != index.metadata['catalog_sha256']:
+            raise ValueError("Catalog changed since the index was built; run a full conversion")
+        
+        abbreviations = dictionary.abbreviations
+        affected = index.affected_rows(changed_terms(index.dictionary, abbreviations))
+        col, sheet = index.metadata['column'], index.metadata['sheet']
+        
+        def is_affected(row: int) -> bool:
+            return affected is None or row in affected
+        
+        # A second reader feeds the engine only the affected descriptions
+        description_rows = iter_catalog_rows(input_path, sheet)
+        next(description_rows, None)
+        descriptions = (_cell(row, col) for i, row in enumerate(description_rows) if is_affected(i))
+        fingerprint = result_fingerprint(ShortNameRules(), abbreviations) if store else None
+        results = _catalog_results(engine, descriptions, store, fingerprint, chunk_size * max(1, workers))
+        
+        rows = iter_catalog_rows(input_path, sheet)
+        previous_rows = iter_catalog_rows(previous_output)
+        header = next(rows, None)
+        expected_header = [str(name) for name in list(header or []) + OUTPUT_COLUMNS]
+        if [str(name) for name in next(previous_rows, [])] != expected_header:
+            raise ValueError(f"Previous output does not match the catalog columns: {previous_output}")
+        
+        count = regenerated = 0
+        started = time.perf_counter()
+        
+        # Write next to the output and rename only once the row counts check
+        # out, so a mismatched previous output never leaves a bad output file
+        output = Path(output_path)
+        tmp_path = output.with_name(f"{output.stem}.partial{output.suffix}")
+        try:
+            with CatalogWriter(str(tmp_path)) as writer:
+                writer.write_row(list(header) + OUTPUT_COLUMNS)
+                
+                for row, previous_row in zip(rows, previous_rows):
+                    if is_affected(count):
+                        result = next(results)
+                        writer.write_row(catalog_output_row(row, len(header), result))
+                        regenerated += 1
+                    else:
+                        writer.write_row(previous_row)
+                    count += 1
+                    
+                    if count % chunk_size == 0:
+                        writer.flush()
+                        if progress:
+                            _report_progress(count, started)
+            
+            previous_count = count + sum(1 for _ in previous_rows)
+            if count != index.rows or previous_count != index.rows:
+                raise ValueError(f"Previous output has {previous_count:,} rows, the index {index.rows:,}; "
+                                 f"run a full conversion")
+            os.replace(tmp_path, output)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        
+        index.save(index_path, input_path, col, sheet, abbreviations)
+    finally:
+        if isinstance(engine, ParallelBatchProcessor):
+            engine.close()
+        if store is not None:
+            store.close()
+    
+    if progress:
+        _report_progress(count, started, done=True, note=f"  ({regenerated:,} regenerated)")
+    
+    return count, regenerated
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for converting a product catalog"""
+    parser = argparse.ArgumentParser(
+        description="Generate short names for a CSV or Excel product catalog"
+    )
+    parser.add_argument('input', nargs='?', help="Catalog file (.csv or .xlsx)")
+    parser.add_argument('output', nargs='?', help="Output file (.csv or .xlsx)")
+    parser.add_argument('-d', '--dictionary', help="Abbreviation dictionary (Excel or CSV)")
+    parser.add_argument('-c', '--column', help="Description column name or 1-based number (default: first column)")
+    parser.add_argument('--sheet', help="Excel sheet to read (default: active sheet)")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="Rows per progress update and worker task")
+    parser.add_argument('-w', '--workers', type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument('--cache-size', type=int, default=0, help="Cache results of repeated descriptions (per worker)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="Do not show progress")
+    parser.add_argument('--index', help="Term-to-row index file: written by full runs, read and refreshed by --previous runs")
+    parser.add_argument('--previous', help="Output of the run that wrote --index; only rows hit by dictionary changes are regenerated")
+    parser.add_argument('--store', help="SQLite result store: reuse results computed by earlier runs and add new ones")
+    parser.add_argument('--compact-store', action='store_true',
+                        help="Delete stored results from other rules/dictionaries (input and output optional)")
+    args = parser.parse_args(argv)
+    
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.previous and not args.index:
+        parser.error("--previous requires --index")
+    if args.compact_store and not args.store:
+        parser.error("--compact-store requires --store")
+    if not (args.input and args.output) and not args.compact_store:
+        parser.error("input and output are required")
+    
+    errors = (OSError, ValueError)
+    if args.store:
+        import sqlite3
+        errors += (sqlite3.Error,)
+    
+    try:
+        # Without input and output only the store compaction runs
+        if args.input and args.previous:
+            update_catalog(
+                args.input, args.output, args.previous, args.index,
+                dictionary_path=args.dictionary,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                cache_size=args.cache_size,
+                progress=not args.quiet,
+                store_path=args.store
+            )
+        elif args.input:
+            convert_catalog(
+                args.input, args.output,
+                dictionary_path=args.dictionary,
+                column=args.column,
+                sheet=args.sheet,
+                chunk_size=args.chunk_size,
+                workers=args.workers,
+                cache_size=args.cache_size,
+                progress=not args.quiet,
+                index_path=args.index,
+                store_path=args.store
+            )
+        
+        if args.compact_store:
+            deleted = compact_store(args.store, args.dictionary)
+            print(f"Removed {deleted:,} stale results from {args.store}", file=sys.stderr)
+    except errors as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())